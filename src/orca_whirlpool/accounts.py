@@ -11,5 +11,7 @@ from .internal.accounts.types import (
     TokenBadge
 )
 from .internal.accounts.account_fetcher import AccountFetcher
+from .internal.accounts.account_cache import AccountCache, AccountCachePolicy, AccountCacheTTL, AccountCacheEntry
 from .internal.accounts.account_parser import AccountParser
 from .internal.accounts.account_finder import AccountFinder
+from .internal.accounts.columnar_decoder import ColumnarDecoder
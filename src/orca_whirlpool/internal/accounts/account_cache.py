@@ -0,0 +1,148 @@
+import dataclasses
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from ..types.enums import AccountType
+
+
+@dataclasses.dataclass(frozen=True)
+class AccountCacheTTL:
+    # None means no expiration
+    seconds: Optional[float] = None
+    slots: Optional[int] = None
+
+
+NO_EXPIRATION = AccountCacheTTL()
+
+
+@dataclasses.dataclass(frozen=True)
+class AccountCachePolicy:
+    # TTL per account type (account types not listed use default_ttl)
+    ttls: Dict[AccountType, AccountCacheTTL] = dataclasses.field(default_factory=dict)
+    default_ttl: AccountCacheTTL = NO_EXPIRATION
+    # LRU bound (None means unbounded)
+    max_entries: Optional[int] = None
+    max_bytes: Optional[int] = None
+    # TTL for missing accounts (None means missing accounts are not cached)
+    negative_ttl: Optional[AccountCacheTTL] = None
+
+    def get_ttl(self, account_type: AccountType) -> AccountCacheTTL:
+        return self.ttls.get(account_type, self.default_ttl)
+
+
+@dataclasses.dataclass(frozen=True)
+class AccountCacheEntry:
+    account_type: AccountType
+    value: Any
+    slot: int
+    cached_at: float
+    size: int
+    # digest of raw account data (None if unknown)
+    fingerprint: Optional[bytes] = None
+
+
+class AccountCache:
+    def __init__(self, policy: AccountCachePolicy = None, clock: Callable[[], float] = time.monotonic):
+        if policy is None:
+            policy = AccountCachePolicy()
+        self._policy = policy
+        self._clock = clock
+        self._entries: OrderedDict[str, AccountCacheEntry] = OrderedDict()
+        self._total_bytes = 0
+        self._latest_slot = 0
+
+    @property
+    def policy(self) -> AccountCachePolicy:
+        return self._policy
+
+    @property
+    def latest_slot(self) -> int:
+        return self._latest_slot
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get_entry(key) is not None
+
+    def observe_slot(self, slot: int):
+        self._latest_slot = max(self._latest_slot, slot)
+
+    def get_entry(self, key: str) -> Optional[AccountCacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._is_expired(entry):
+            self.invalidate(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: str) -> Any:
+        entry = self.get_entry(key)
+        return None if entry is None else entry.value
+
+    def put(self, key: str, account_type: AccountType, value: Any, slot: int, size: int, fingerprint: Optional[bytes] = None) -> AccountCacheEntry:
+        self.observe_slot(slot)
+        # concurrent fetches may complete out of order, a response read at an older slot must not overwrite a newer entry
+        current = self._entries.get(key)
+        if current is not None and current.slot > slot and not self._is_expired(current):
+            return current
+
+        self.invalidate(key)
+        entry = AccountCacheEntry(
+            account_type=account_type,
+            value=value,
+            slot=slot,
+            cached_at=self._clock(),
+            size=size,
+            fingerprint=fingerprint,
+        )
+        self._entries[key] = entry
+        self._total_bytes += size
+        self._evict()
+        return entry
+
+    def put_missing(self, key: str, account_type: AccountType, slot: int) -> Optional[AccountCacheEntry]:
+        if self._policy.negative_ttl is None:
+            # the account is gone, so a value cached at an older slot must not be returned
+            current = self._entries.get(key)
+            if current is not None and current.slot <= slot:
+                self.invalidate(key)
+            return None
+        return self.put(key, account_type, None, slot, 0)
+
+    def invalidate(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry.size
+
+    def clear(self):
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def _is_expired(self, entry: AccountCacheEntry) -> bool:
+        if entry.value is None:
+            ttl = self._policy.negative_ttl
+        else:
+            ttl = self._policy.get_ttl(entry.account_type)
+        if ttl.seconds is not None and self._clock() - entry.cached_at > ttl.seconds:
+            return True
+        if ttl.slots is not None and self._latest_slot - entry.slot > ttl.slots:
+            return True
+        return False
+
+    def _evict(self):
+        max_entries = self._policy.max_entries
+        max_bytes = self._policy.max_bytes
+        while len(self._entries) > 0:
+            over_entries = max_entries is not None and len(self._entries) > max_entries
+            over_bytes = max_bytes is not None and self._total_bytes > max_bytes
+            if not over_entries and not over_bytes:
+                break
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.size
@@ -1,114 +1,478 @@
-from typing import List, Optional
+import asyncio
+import dataclasses
+import hashlib
+import time
+from typing import Any, Coroutine, Dict, List, Optional, Set, Tuple
 from solders.account import Account
 from solders.pubkey import Pubkey
 from solana.rpc.async_api import AsyncClient
-from ..types.types import BlockTimestamp
+from solana.rpc.types import DataSliceOpts
+from spl.token.constants import ACCOUNT_LEN, MINT_LEN
+from ..constants import ACCOUNT_SIZE_WHIRLPOOLS_CONFIG, ACCOUNT_SIZE_FEE_TIER, ACCOUNT_SIZE_WHIRLPOOL, ACCOUNT_SIZE_TICK_ARRAY
+from ..constants import ACCOUNT_SIZE_POSITION, ACCOUNT_SIZE_POSITION_BUNDLE, ACCOUNT_SIZE_WHIRLPOOLS_CONFIG_EXTENSION, ACCOUNT_SIZE_TOKEN_BADGE
+from ..types.types import BlockTimestamp, AccountSnapshot
+from ..errors import WhirlpoolError, AccountFetcherErrorCode
+from ..types.enums import AccountType, TickArrayDecoding
 from .types import WhirlpoolsConfig, FeeTier, Whirlpool, TickArray, Position, PositionBundle, MintInfo, AccountInfo
 from .types import WhirlpoolsConfigExtension, TokenBadge
-from .account_parser import AccountParser
+from .account_parser import AccountParser, WHIRLPOOL_HOT_FIELDS_OFFSET, WHIRLPOOL_HOT_FIELDS_LENGTH
 from .keyed_account_converter import KeyedAccountConverter
+from .keyed_account_decoder import KeyedAccountDecoder
+from .account_cache import AccountCache, AccountCachePolicy
 
 
 BULK_FETCH_CHUNK_SIZE = 100
+BULK_FETCH_CONCURRENCY = 4
+BULK_FETCH_MAX_RETRIES = 2
+BULK_FETCH_RETRY_DELAY = 0.1
+# adaptive chunk sizing
+BULK_FETCH_CHUNK_MAX_BYTES = 512 * 1024
+BULK_FETCH_TARGET_LATENCY = 1.0
+# slot-consistent snapshot
+SNAPSHOT_MAX_RETRIES = 3
+
+ACCOUNT_SIZES = {
+    AccountType.WhirlpoolsConfig: ACCOUNT_SIZE_WHIRLPOOLS_CONFIG,
+    AccountType.FeeTier: ACCOUNT_SIZE_FEE_TIER,
+    AccountType.Whirlpool: ACCOUNT_SIZE_WHIRLPOOL,
+    AccountType.TickArray: ACCOUNT_SIZE_TICK_ARRAY,
+    AccountType.Position: ACCOUNT_SIZE_POSITION,
+    AccountType.PositionBundle: ACCOUNT_SIZE_POSITION_BUNDLE,
+    AccountType.WhirlpoolsConfigExtension: ACCOUNT_SIZE_WHIRLPOOLS_CONFIG_EXTENSION,
+    AccountType.TokenBadge: ACCOUNT_SIZE_TOKEN_BADGE,
+    AccountType.TokenAccount: ACCOUNT_LEN,
+    AccountType.TokenMint: MINT_LEN,
+}
+
+ACCOUNT_HANDLERS = {
+    # account type: (parser, keyed converter, parse with program id)
+    AccountType.WhirlpoolsConfig: (AccountParser.parse_whirlpools_config, KeyedAccountConverter.to_keyed_whirlpools_config, False),
+    AccountType.FeeTier: (AccountParser.parse_fee_tier, KeyedAccountConverter.to_keyed_fee_tier, False),
+    AccountType.Whirlpool: (AccountParser.parse_whirlpool, KeyedAccountConverter.to_keyed_whirlpool, False),
+    AccountType.TickArray: (AccountParser.parse_tick_array, KeyedAccountConverter.to_keyed_tick_array, False),
+    AccountType.Position: (AccountParser.parse_position, KeyedAccountConverter.to_keyed_position, False),
+    AccountType.PositionBundle: (AccountParser.parse_position_bundle, KeyedAccountConverter.to_keyed_position_bundle, False),
+    AccountType.WhirlpoolsConfigExtension: (AccountParser.parse_whirlpools_config_extension, KeyedAccountConverter.to_keyed_whirlpools_config_extension, False),
+    AccountType.TokenBadge: (AccountParser.parse_token_badge, KeyedAccountConverter.to_keyed_token_badge, False),
+    AccountType.TokenAccount: (AccountParser.parse_token_account, KeyedAccountConverter.to_keyed_token_account, True),
+    AccountType.TokenMint: (AccountParser.parse_token_mint, KeyedAccountConverter.to_keyed_token_mint, True),
+}
+
+# account types decoded directly into keyed types
+KEYED_DECODERS = {
+    AccountType.Whirlpool: KeyedAccountDecoder.decode_whirlpool,
+    AccountType.Position: KeyedAccountDecoder.decode_position,
+    AccountType.TickArray: KeyedAccountDecoder.decode_tick_array,
+}
+
+TICK_ARRAY_KEYED_DECODERS = {
+    TickArrayDecoding.Eager: KeyedAccountDecoder.decode_tick_array,
+    TickArrayDecoding.Lazy: KeyedAccountDecoder.decode_tick_array_lazy,
+    TickArrayDecoding.Sparse: KeyedAccountDecoder.decode_tick_array_sparse,
+}
+
+
+class ChunkSizer:
+    def __init__(self, account_size: Optional[int]):
+        if account_size is None:
+            max_chunk_size = BULK_FETCH_CHUNK_SIZE
+        else:
+            max_chunk_size = max(1, min(BULK_FETCH_CHUNK_SIZE, BULK_FETCH_CHUNK_MAX_BYTES // account_size))
+        self.max_chunk_size = max_chunk_size
+        self.chunk_size = max_chunk_size
+
+    def on_success(self, chunk_size: int, latency: float, response_bytes: int):
+        if response_bytes > BULK_FETCH_CHUNK_MAX_BYTES:
+            # accounts are larger than expected (e.g. Token-2022 extensions)
+            avg_account_bytes = response_bytes / chunk_size
+            self.max_chunk_size = max(1, int(BULK_FETCH_CHUNK_MAX_BYTES // avg_account_bytes))
+            self.chunk_size = min(self.chunk_size, self.max_chunk_size)
+        if latency > BULK_FETCH_TARGET_LATENCY:
+            self.chunk_size = max(1, self.chunk_size // 2)
+        elif latency < BULK_FETCH_TARGET_LATENCY / 2:
+            self.chunk_size = min(self.max_chunk_size, self.chunk_size + max(1, self.chunk_size // 4))
+
+    def on_failure(self):
+        self.chunk_size = max(1, self.chunk_size // 2)
 
 
 # https://github.com/orca-so/whirlpools/blob/7b9ec351e2048c5504ffc8894c0ec5a9e78dc113/sdk/src/network/public/fetcher.ts
 class AccountFetcher:
-    def __init__(self, connection: AsyncClient):
+    def __init__(
+        self,
+        connection: AsyncClient,
+        cache_policy: AccountCachePolicy = None,
+        batch_window: Optional[float] = None,
+        batch_max_size: int = BULK_FETCH_CHUNK_SIZE,
+        bulk_fetch_concurrency: int = BULK_FETCH_CONCURRENCY,
+        bulk_fetch_max_retries: int = BULK_FETCH_MAX_RETRIES,
+        tick_array_decoding: TickArrayDecoding = TickArrayDecoding.Eager,
+    ):
         self._connection = connection
-        self._cache = {}
+        self._keyed_decoders = dict(KEYED_DECODERS)
+        self._keyed_decoders[AccountType.TickArray] = TICK_ARRAY_KEYED_DECODERS[tick_array_decoding]
+        self._cache = AccountCache(cache_policy)
+        self._inflight: Dict[Tuple[AccountType, str], asyncio.Future] = {}
+        # references to running background tasks (event loop keeps only weak references)
+        self._tasks: Set[asyncio.Task] = set()
+        # micro-batching of single account fetches (disabled if batch_window is None)
+        self._batch_window = batch_window
+        self._batch_max_size = batch_max_size
+        self._batch: List[Tuple[Pubkey, AccountType, asyncio.Future]] = []
+        self._batch_timer: Optional[asyncio.TimerHandle] = None
+        # concurrent dispatch of get_multiple_accounts chunks
+        self._bulk_fetch_concurrency = bulk_fetch_concurrency
+        self._bulk_fetch_max_retries = bulk_fetch_max_retries
+        # shared by all chunk dispatches (created on first use in the running loop)
+        self._bulk_fetch_semaphore: Optional[asyncio.Semaphore] = None
+        self._bulk_fetch_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._chunk_sizers: Dict[Optional[AccountType], ChunkSizer] = {}
+
+    @property
+    def cache(self) -> AccountCache:
+        return self._cache
+
+    async def _get(self, pubkey: Pubkey, account_type: AccountType, refresh: bool):
+        return (await self._load([(pubkey, account_type)], refresh, False))[0]
+
+    async def _list(self, pubkeys: List[Pubkey], account_type: AccountType, refresh: bool):
+        return await self._load([(pubkey, account_type) for pubkey in pubkeys], refresh, True)
+
+    async def _load(self, items: List[Tuple[Pubkey, AccountType]], refresh: bool, bulk: bool):
+        results = {}
+        waiting = {}
+        fetch_needed = []
+        for pubkey, account_type in items:
+            item_key = (account_type, str(pubkey))
+            if item_key in results or item_key in waiting:
+                continue
+            if not refresh:
+                entry = self._cache.get_entry(str(pubkey))
+                if entry is not None:
+                    results[item_key] = entry.value
+                    continue
+            # concurrent callers share the in-flight fetch (refresh=True also joins it)
+            inflight = self._inflight.get(item_key)
+            if inflight is not None:
+                waiting[item_key] = inflight
+                continue
+            fetch_needed.append((pubkey, account_type))
+
+        if len(fetch_needed) > 0:
+            loop = asyncio.get_running_loop()
+            futures = {}
+            for pubkey, account_type in fetch_needed:
+                future = loop.create_future()
+                self._inflight[(account_type, str(pubkey))] = future
+                futures[(account_type, str(pubkey))] = future
+            # the fetch runs in its own task so that cancelling one caller doesn't cancel it for the others
+            self._create_task(self._fetch(fetch_needed, bulk, futures))
+            waiting.update(futures)
+
+        for item_key, future in waiting.items():
+            results[item_key] = await asyncio.shield(future)
+
+        return [results[(account_type, str(pubkey))] for pubkey, account_type in items]
+
+    def _create_task(self, coro: Coroutine) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _fetch(self, items: List[Tuple[Pubkey, AccountType]], bulk: bool, futures: Dict[Tuple[AccountType, str], asyncio.Future]):
+        try:
+            pubkeys = [pubkey for pubkey, _ in items]
+            if bulk:
+                # chunk size is limited by the largest account type
+                account_type = max(set(account_type for _, account_type in items), key=lambda t: ACCOUNT_SIZES[t])
+                fetched, slots = await self._bulk_fetch(pubkeys, account_type)
+            elif self._batch_window is not None:
+                account, slot = await self._batched_fetch(pubkeys[0], items[0][1])
+                fetched, slots = [account], [slot]
+            else:
+                res = await self._connection.get_account_info(pubkeys[0])
+                self._cache.observe_slot(res.context.slot)
+                fetched, slots = [res.value], [res.context.slot]
+
+            for (pubkey, account_type), account, slot in zip(items, fetched, slots):
+                futures[(account_type, str(pubkey))].set_result(self._parse_and_cache(pubkey, account_type, account, slot))
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # avoid "exception was never retrieved" warning if all callers have been cancelled
+                    future.exception()
+        finally:
+            for item_key, future in futures.items():
+                if self._inflight.get(item_key) is future:
+                    del self._inflight[item_key]
+
+    async def _batched_fetch(self, pubkey: Pubkey, account_type: AccountType) -> Tuple[Optional[Account], int]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((pubkey, account_type, future))
+        if len(self._batch) >= self._batch_max_size:
+            self._flush_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = loop.call_later(self._batch_window, self._flush_batch)
+        return await future
 
-    async def _get(self, pubkey: Pubkey, parser, keyed_converter, refresh: bool, parse_with_program_id: bool = False):
-        key = str(pubkey)
-        if not refresh and key in self._cache:
-            return self._cache[key]
+    def _flush_batch(self):
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        batch, self._batch = self._batch, []
+        if len(batch) > 0:
+            self._create_task(self._dispatch_batch(batch))
 
-        res = await self._connection.get_account_info(pubkey)
-        if res.value is None:
+    async def _dispatch_batch(self, batch: List[Tuple[Pubkey, AccountType, asyncio.Future]]):
+        try:
+            # chunk size is limited by the largest account type
+            account_type = max(set(account_type for _, account_type, _ in batch), key=lambda t: ACCOUNT_SIZES[t])
+            fetched, slots = await self._bulk_fetch([pubkey for pubkey, _, _ in batch], account_type)
+            for (_, _, future), account, slot in zip(batch, fetched, slots):
+                if not future.done():
+                    future.set_result((account, slot))
+        except asyncio.CancelledError:
+            for _, _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _parse_and_cache(self, pubkey: Pubkey, account_type: AccountType, account: Optional[Account], slot: int):
+        if account is None:
+            self._cache.put_missing(str(pubkey), account_type, slot)
             return None
 
-        parsed = parser(res.value.data, res.value.owner) if parse_with_program_id else parser(res.value.data)
-        if parsed is None:
+        # skip parsing if raw data is not changed
+        fingerprint = AccountFetcher._fingerprint(account)
+        cached = self._cache.get_entry(str(pubkey))
+        if cached is not None and cached.value is not None and cached.account_type == account_type and cached.fingerprint == fingerprint:
+            self._cache.put(str(pubkey), account_type, cached.value, slot, cached.size, fingerprint)
+            return cached.value
+
+        keyed_decoder = self._keyed_decoders.get(account_type)
+        if keyed_decoder is not None:
+            keyed = keyed_decoder(pubkey, account.data)
+        else:
+            parser, keyed_converter, parse_with_program_id = ACCOUNT_HANDLERS[account_type]
+            parsed = parser(account.data, account.owner) if parse_with_program_id else parser(account.data)
+            keyed = keyed_converter(pubkey, parsed)
+        if keyed is None:
             return None
-        keyed = keyed_converter(pubkey, parsed)
 
-        self._cache[key] = keyed
+        self._cache.put(str(pubkey), account_type, keyed, slot, len(account.data), fingerprint)
         return keyed
 
-    async def _list(self, pubkeys: List[Pubkey], parser, keyed_converter, refresh: bool, parse_with_program_id: bool = False):
-        fetch_needed = list(filter(lambda p: refresh or str(p) not in self._cache, pubkeys))
+    @staticmethod
+    def _fingerprint(account: Account) -> bytes:
+        hasher = hashlib.blake2b(account.data, digest_size=16)
+        hasher.update(bytes(account.owner))
+        return hasher.digest()
 
-        if len(fetch_needed) > 0:
-            fetched = await self._bulk_fetch(fetch_needed)
-            for i in range(len(fetch_needed)):
-                if fetched[i] is None:
-                    continue
-                parsed = parser(fetched[i].data, fetched[i].owner) if parse_with_program_id else parser(fetched[i].data)
-                if parsed is None:
-                    continue
-                keyed = keyed_converter(fetch_needed[i], parsed)
-                self._cache[str(fetch_needed[i])] = keyed
+    def _get_chunk_sizer(self, account_type: Optional[AccountType]) -> ChunkSizer:
+        sizer = self._chunk_sizers.get(account_type)
+        if sizer is None:
+            sizer = ChunkSizer(ACCOUNT_SIZES.get(account_type))
+            self._chunk_sizers[account_type] = sizer
+        return sizer
+
+    def _get_bulk_fetch_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._bulk_fetch_semaphore is None or self._bulk_fetch_semaphore_loop is not loop:
+            self._bulk_fetch_semaphore = asyncio.Semaphore(self._bulk_fetch_concurrency)
+            self._bulk_fetch_semaphore_loop = loop
+        return self._bulk_fetch_semaphore
 
-        return list(map(lambda p: self._cache.get(str(p)), pubkeys))
+    async def _bulk_fetch(self, pubkeys: List[Pubkey], account_type: Optional[AccountType] = None, data_slice: Optional[DataSliceOpts] = None) -> Tuple[List[Optional[Account]], List[int]]:
+        sizer = self._get_chunk_sizer(account_type)
+        chunk_size = sizer.chunk_size
+        chunks = [pubkeys[i:(i+chunk_size)] for i in range(0, len(pubkeys), chunk_size)]
+        fetched = await self._fetch_chunks(chunks, sizer, data_slice)
 
-    async def _bulk_fetch(self, pubkeys: List[Pubkey]) -> List[Optional[Account]]:
+        # gather keeps the order of chunks
         accounts = []
-        for i in range(0, len(pubkeys), BULK_FETCH_CHUNK_SIZE):
-            chunk = pubkeys[i:(i+BULK_FETCH_CHUNK_SIZE)]
-            fetched = await self._connection.get_multiple_accounts(chunk)
-            accounts.extend(fetched.value)
-        return accounts
+        slots = []
+        for chunk, (chunk_accounts, slot) in zip(chunks, fetched):
+            accounts.extend(chunk_accounts)
+            slots.extend([slot] * len(chunk))
+        return accounts, slots
+
+    async def _fetch_chunks(self, chunks: List[List[Pubkey]], sizer: ChunkSizer, data_slice: Optional[DataSliceOpts] = None) -> List[Tuple[List[Optional[Account]], int]]:
+        semaphore = self._get_bulk_fetch_semaphore()
+
+        async def fetch_chunk_with_semaphore(chunk: List[Pubkey]) -> Tuple[List[Optional[Account]], int]:
+            async with semaphore:
+                return await self._fetch_chunk(chunk, sizer, data_slice)
+
+        tasks = [asyncio.ensure_future(fetch_chunk_with_semaphore(chunk)) for chunk in chunks]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+    async def _fetch_chunk(self, chunk: List[Pubkey], sizer: ChunkSizer, data_slice: Optional[DataSliceOpts] = None) -> Tuple[List[Optional[Account]], int]:
+        retry = 0
+        while True:
+            try:
+                started = time.monotonic()
+                if data_slice is None:
+                    fetched = await self._connection.get_multiple_accounts(chunk)
+                else:
+                    fetched = await self._connection.get_multiple_accounts(chunk, data_slice=data_slice)
+                latency = time.monotonic() - started
+                break
+            except Exception:
+                sizer.on_failure()
+                if retry >= self._bulk_fetch_max_retries:
+                    raise
+                await asyncio.sleep(BULK_FETCH_RETRY_DELAY * 2**retry)
+                retry += 1
+
+        response_bytes = sum(len(account.data) for account in fetched.value if account is not None)
+        sizer.on_success(len(chunk), latency, response_bytes)
+        self._cache.observe_slot(fetched.context.slot)
+        return fetched.value, fetched.context.slot
 
     async def get_whirlpool(self, pubkey: Pubkey, refresh: bool = False) -> Optional[Whirlpool]:
-        return await self._get(pubkey, AccountParser.parse_whirlpool, KeyedAccountConverter.to_keyed_whirlpool, refresh)
+        return await self._get(pubkey, AccountType.Whirlpool, refresh)
 
     async def get_whirlpools_config(self, pubkey: Pubkey, refresh: bool = False) -> Optional[WhirlpoolsConfig]:
-        return await self._get(pubkey, AccountParser.parse_whirlpools_config, KeyedAccountConverter.to_keyed_whirlpools_config, refresh)
+        return await self._get(pubkey, AccountType.WhirlpoolsConfig, refresh)
 
     async def get_fee_tier(self, pubkey: Pubkey, refresh: bool = False) -> Optional[FeeTier]:
-        return await self._get(pubkey, AccountParser.parse_fee_tier, KeyedAccountConverter.to_keyed_fee_tier, refresh)
+        return await self._get(pubkey, AccountType.FeeTier, refresh)
 
     async def get_position(self, pubkey: Pubkey, refresh: bool = False) -> Optional[Position]:
-        return await self._get(pubkey, AccountParser.parse_position, KeyedAccountConverter.to_keyed_position, refresh)
+        return await self._get(pubkey, AccountType.Position, refresh)
 
     async def get_tick_array(self, pubkey: Pubkey, refresh: bool = False) -> Optional[TickArray]:
-        return await self._get(pubkey, AccountParser.parse_tick_array, KeyedAccountConverter.to_keyed_tick_array, refresh)
+        return await self._get(pubkey, AccountType.TickArray, refresh)
 
     async def get_position_bundle(self, pubkey: Pubkey, refresh: bool = False) -> Optional[PositionBundle]:
-        return await self._get(pubkey, AccountParser.parse_position_bundle, KeyedAccountConverter.to_keyed_position_bundle, refresh)
+        return await self._get(pubkey, AccountType.PositionBundle, refresh)
 
     async def get_whirlpools_config_extension(self, pubkey: Pubkey, refresh: bool = False) -> Optional[WhirlpoolsConfigExtension]:
-        return await self._get(pubkey, AccountParser.parse_whirlpools_config_extension, KeyedAccountConverter.to_keyed_whirlpools_config_extension, refresh)
+        return await self._get(pubkey, AccountType.WhirlpoolsConfigExtension, refresh)
 
     async def get_token_badge(self, pubkey: Pubkey, refresh: bool = False) -> Optional[TokenBadge]:
-        return await self._get(pubkey, AccountParser.parse_token_badge, KeyedAccountConverter.to_keyed_token_badge, refresh)
+        return await self._get(pubkey, AccountType.TokenBadge, refresh)
 
     async def get_token_account(self, pubkey: Pubkey, refresh: bool = False) -> Optional[AccountInfo]:
-        return await self._get(pubkey, AccountParser.parse_token_account, KeyedAccountConverter.to_keyed_token_account, refresh, True)
+        return await self._get(pubkey, AccountType.TokenAccount, refresh)
 
     async def get_token_mint(self, pubkey: Pubkey, refresh: bool = False) -> Optional[MintInfo]:
-        return await self._get(pubkey, AccountParser.parse_token_mint, KeyedAccountConverter.to_keyed_token_mint, refresh, True)
+        return await self._get(pubkey, AccountType.TokenMint, refresh)
 
     async def list_whirlpools(self, pubkeys: List[Pubkey], refresh: bool = False) -> List[Optional[Whirlpool]]:
-        return await self._list(pubkeys, AccountParser.parse_whirlpool, KeyedAccountConverter.to_keyed_whirlpool, refresh)
+        return await self._list(pubkeys, AccountType.Whirlpool, refresh)
 
     async def list_positions(self, pubkeys: List[Pubkey], refresh: bool = False) -> List[Optional[Position]]:
-        return await self._list(pubkeys, AccountParser.parse_position, KeyedAccountConverter.to_keyed_position, refresh)
+        return await self._list(pubkeys, AccountType.Position, refresh)
 
     async def list_tick_arrays(self, pubkeys: List[Pubkey], refresh: bool = False) -> List[Optional[TickArray]]:
-        return await self._list(pubkeys, AccountParser.parse_tick_array, KeyedAccountConverter.to_keyed_tick_array, refresh)
+        return await self._list(pubkeys, AccountType.TickArray, refresh)
 
     async def list_position_bundles(self, pubkeys: List[Pubkey], refresh: bool = False) -> List[Optional[PositionBundle]]:
-        return await self._list(pubkeys, AccountParser.parse_position_bundle, KeyedAccountConverter.to_keyed_position_bundle, refresh)
+        return await self._list(pubkeys, AccountType.PositionBundle, refresh)
 
     async def list_token_badges(self, pubkeys: List[Pubkey], refresh: bool = False) -> List[Optional[TokenBadge]]:
-        return await self._list(pubkeys, AccountParser.parse_token_badge, KeyedAccountConverter.to_keyed_token_badge, refresh)
+        return await self._list(pubkeys, AccountType.TokenBadge, refresh)
 
     async def list_token_accounts(self, pubkeys: List[Pubkey], refresh: bool = False) -> List[Optional[AccountInfo]]:
-        return await self._list(pubkeys, AccountParser.parse_token_account, KeyedAccountConverter.to_keyed_token_account, refresh, True)
+        return await self._list(pubkeys, AccountType.TokenAccount, refresh)
 
     async def list_token_mints(self, pubkeys: List[Pubkey], refresh: bool = False) -> List[Optional[MintInfo]]:
-        return await self._list(pubkeys, AccountParser.parse_token_mint, KeyedAccountConverter.to_keyed_token_mint, refresh, True)
+        return await self._list(pubkeys, AccountType.TokenMint, refresh)
+
+    async def fetch_many(self, items: List[Tuple[Pubkey, AccountType]], refresh: bool = False) -> List[Optional[Any]]:
+        return await self._load(items, refresh, True)
+
+    async def refresh_changed(self, items: List[Tuple[Pubkey, AccountType]]) -> List[Pubkey]:
+        # refresh accounts and return pubkeys whose data has been changed since cached.
+        # accounts with unchanged data are not parsed again, and cached instances are reused.
+        before = [self._cache.get(str(pubkey)) for pubkey, _ in items]
+        after = await self._load(items, True, True)
+        return [pubkey for (pubkey, _), b, a in zip(items, before, after) if b is not a]
+
+    async def hot_refresh_whirlpools(self, pubkeys: List[Pubkey]) -> List[Optional[Whirlpool]]:
+        # cached whirlpools are patched with liquidity, sqrt_price and tick_current_index fetched by data_slice.
+        # get_slot of a patched whirlpool still returns the slot of the last full fetch.
+        # whirlpools not in the cache are fully fetched.
+        results = {}
+        hot = []
+        cold = []
+        for pubkey in pubkeys:
+            entry = self._cache.get_entry(str(pubkey))
+            if entry is not None and isinstance(entry.value, Whirlpool):
+                hot.append((pubkey, entry))
+            else:
+                cold.append(pubkey)
+
+        if len(hot) > 0:
+            data_slice = DataSliceOpts(offset=WHIRLPOOL_HOT_FIELDS_OFFSET, length=WHIRLPOOL_HOT_FIELDS_LENGTH)
+            fetched, _ = await self._bulk_fetch([pubkey for pubkey, _ in hot], None, data_slice)
+            for (pubkey, entry), account in zip(hot, fetched):
+                hot_fields = None if account is None else AccountParser.parse_whirlpool_hot_fields(account.data)
+                if hot_fields is None:
+                    self._cache.invalidate(str(pubkey))
+                    results[str(pubkey)] = None
+                    continue
+                liquidity, sqrt_price, tick_current_index = hot_fields
+                patched = dataclasses.replace(
+                    entry.value,
+                    liquidity=liquidity,
+                    sqrt_price=sqrt_price,
+                    tick_current_index=tick_current_index,
+                )
+                # fingerprint is dropped because patched whirlpool doesn't reflect whole raw data
+                # slot is kept because other fields (fees, rewards, ...) are still at the slot of the full fetch
+                self._cache.put(str(pubkey), AccountType.Whirlpool, patched, entry.slot, entry.size)
+                results[str(pubkey)] = patched
+
+        if len(cold) > 0:
+            for pubkey, whirlpool in zip(cold, await self.list_whirlpools(cold, True)):
+                results[str(pubkey)] = whirlpool
+
+        return [results[str(pubkey)] for pubkey in pubkeys]
+
+    async def fetch_snapshot(self, items: List[Tuple[Pubkey, AccountType]]) -> AccountSnapshot:
+        # accounts in one chunk are fetched by one get_multiple_accounts, so they are always at the same slot.
+        # more accounts need several requests, and they are retried until all responses have the same context slot.
+        pubkeys = [pubkey for pubkey, _ in items]
+        # chunk size is limited by the largest account type
+        largest_account_type = max(set(account_type for _, account_type in items), key=lambda t: ACCOUNT_SIZES[t], default=None)
+        sizer = self._get_chunk_sizer(largest_account_type)
+        for _ in range(SNAPSHOT_MAX_RETRIES + 1):
+            chunk_size = sizer.chunk_size
+            chunks = [pubkeys[i:(i+chunk_size)] for i in range(0, len(pubkeys), chunk_size)]
+            fetched = await self._fetch_chunks(chunks, sizer)
+            slots = set(slot for _, slot in fetched)
+            if len(slots) <= 1:
+                break
+        else:
+            raise WhirlpoolError(AccountFetcherErrorCode.InconsistentSnapshotSlot)
+
+        slot = slots.pop() if len(slots) == 1 else self._cache.latest_slot
+        accounts = [account for chunk_accounts, _ in fetched for account in chunk_accounts]
+        return AccountSnapshot(
+            slot=slot,
+            accounts=[self._parse_and_cache(pubkey, account_type, account, slot) for (pubkey, account_type), account in zip(items, accounts)],
+        )
+
+    def get_slot(self, pubkey: Pubkey) -> Optional[int]:
+        entry = self._cache.get_entry(str(pubkey))
+        return None if entry is None else entry.slot
 
     async def get_latest_block_timestamp(self) -> BlockTimestamp:
         res1 = await self._connection.get_latest_blockhash()
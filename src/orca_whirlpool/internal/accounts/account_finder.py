@@ -82,12 +82,11 @@ class AccountFinder:
 
         candidates = []
         for token_account in accounts:
-            parsed = TokenUtil.deserialize_account(token_account.account.data, token_program_id)
-
-            # maybe NFT
-            if parsed.amount == 1:
+            # maybe NFT (check amount without deserializing whole account)
+            if TokenUtil.read_token_account_amount(token_account.account.data) == 1:
+                mint = TokenUtil.read_token_account_mint(token_account.account.data)
                 # derive position address
-                position = PDAUtil.get_position(program_id, parsed.mint).pubkey
+                position = PDAUtil.get_position(program_id, mint).pubkey
                 candidates.append(position)
 
         fetcher = AccountFetcher(self._connection)
@@ -103,12 +102,11 @@ class AccountFinder:
 
         candidates = []
         for token_account in accounts:
-            parsed = TokenUtil.deserialize_account(token_account.account.data, TOKEN_PROGRAM_ID)
-
-            # maybe NFT
-            if parsed.amount == 1:
+            # maybe NFT (check amount without deserializing whole account)
+            if TokenUtil.read_token_account_amount(token_account.account.data) == 1:
+                mint = TokenUtil.read_token_account_mint(token_account.account.data)
                 # derive position bundle address
-                position = PDAUtil.get_position_bundle(program_id, parsed.mint).pubkey
+                position = PDAUtil.get_position_bundle(program_id, mint).pubkey
                 candidates.append(position)
 
         fetcher = AccountFetcher(self._connection)
@@ -1,11 +1,45 @@
-from typing import Optional
+from typing import Any, Optional, Tuple
 from solders.pubkey import Pubkey
+from anchorpy.coder.accounts import ACCOUNT_DISCRIMINATOR_SIZE
+from spl.token.constants import TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID, ACCOUNT_LEN, MINT_LEN
 from spl.token.core import AccountInfo as SolanapyAccountInfo, MintInfo as SolanapyMintInfo
 from ..anchor.accounts import WhirlpoolsConfig as AnchorWhirlpoolsConfig, FeeTier as AnchorFeeTier
 from ..anchor.accounts import Whirlpool as AnchorWhirlpool, TickArray as AnchorTickArray, Position as AnchorPosition
 from ..anchor.accounts import PositionBundle as AnchorPositionBundle
 from ..anchor.accounts import WhirlpoolsConfigExtension as AnchorWhirlpoolsConfigExtension, TokenBadge as AnchorTokenBadge
+from ..constants import ORCA_WHIRLPOOL_PROGRAM_ID
+from ..constants import ACCOUNT_SIZE_WHIRLPOOLS_CONFIG, ACCOUNT_SIZE_FEE_TIER, ACCOUNT_SIZE_WHIRLPOOL, ACCOUNT_SIZE_TICK_ARRAY
+from ..constants import ACCOUNT_SIZE_POSITION, ACCOUNT_SIZE_POSITION_BUNDLE, ACCOUNT_SIZE_WHIRLPOOLS_CONFIG_EXTENSION, ACCOUNT_SIZE_TOKEN_BADGE
+from ..types.enums import AccountType
 from ..utils.token_util import TokenUtil
+from .tick_array_decoder import TickArrayDecoder
+
+# Whirlpool layout (head)
+# discriminator(8) + whirlpools_config(32) + whirlpool_bump(u8) + tick_spacing(u16) + tick_spacing_seed(u8 * 2)
+#   + fee_rate(u16) + protocol_fee_rate(u16) + liquidity(u128) + sqrt_price(u128) + tick_current_index(i32) + ...
+# liquidity, sqrt_price, tick_current_index are contiguous and fetched as hot fields
+WHIRLPOOL_LIQUIDITY_OFFSET = ACCOUNT_DISCRIMINATOR_SIZE + 32 + 1 + 2 + 2 + 2 + 2
+WHIRLPOOL_SQRT_PRICE_OFFSET = WHIRLPOOL_LIQUIDITY_OFFSET + 16
+WHIRLPOOL_TICK_CURRENT_INDEX_OFFSET = WHIRLPOOL_SQRT_PRICE_OFFSET + 16
+WHIRLPOOL_HOT_FIELDS_OFFSET = WHIRLPOOL_LIQUIDITY_OFFSET
+WHIRLPOOL_HOT_FIELDS_LENGTH = WHIRLPOOL_TICK_CURRENT_INDEX_OFFSET + 4 - WHIRLPOOL_HOT_FIELDS_OFFSET
+
+# Token-2022 account with extensions has AccountType at this offset (1: Mint, 2: Account)
+TOKEN_2022_ACCOUNT_TYPE_OFFSET = ACCOUNT_LEN
+TOKEN_2022_ACCOUNT_TYPE_MINT = 1
+TOKEN_2022_ACCOUNT_TYPE_ACCOUNT = 2
+
+ANCHOR_DECODERS = {
+    # discriminator: (account type, min data length, decoder)
+    AnchorWhirlpoolsConfig.discriminator: (AccountType.WhirlpoolsConfig, ACCOUNT_SIZE_WHIRLPOOLS_CONFIG, AnchorWhirlpoolsConfig.decode),
+    AnchorFeeTier.discriminator: (AccountType.FeeTier, ACCOUNT_SIZE_FEE_TIER, AnchorFeeTier.decode),
+    AnchorWhirlpool.discriminator: (AccountType.Whirlpool, ACCOUNT_SIZE_WHIRLPOOL, AnchorWhirlpool.decode),
+    AnchorTickArray.discriminator: (AccountType.TickArray, ACCOUNT_SIZE_TICK_ARRAY, TickArrayDecoder.decode),
+    AnchorPosition.discriminator: (AccountType.Position, ACCOUNT_SIZE_POSITION, AnchorPosition.decode),
+    AnchorPositionBundle.discriminator: (AccountType.PositionBundle, ACCOUNT_SIZE_POSITION_BUNDLE, AnchorPositionBundle.decode),
+    AnchorWhirlpoolsConfigExtension.discriminator: (AccountType.WhirlpoolsConfigExtension, ACCOUNT_SIZE_WHIRLPOOLS_CONFIG_EXTENSION, AnchorWhirlpoolsConfigExtension.decode),
+    AnchorTokenBadge.discriminator: (AccountType.TokenBadge, ACCOUNT_SIZE_TOKEN_BADGE, AnchorTokenBadge.decode),
+}
 
 
 def safe_decode(decode, data, program_id: Optional[Pubkey] = None):
@@ -30,12 +64,24 @@ class AccountParser:
 
     @staticmethod
     def parse_tick_array(data: bytes) -> Optional[AnchorTickArray]:
-        return safe_decode(AnchorTickArray.decode, data)
+        return safe_decode(TickArrayDecoder.decode, data)
 
     @staticmethod
     def parse_whirlpool(data: bytes) -> Optional[AnchorWhirlpool]:
         return safe_decode(AnchorWhirlpool.decode, data)
 
+    @staticmethod
+    def parse_whirlpool_hot_fields(data: bytes) -> Optional[Tuple[int, int, int]]:
+        if len(data) != WHIRLPOOL_HOT_FIELDS_LENGTH:
+            return None
+        # offsets relative to the slice
+        sqrt_price_offset = WHIRLPOOL_SQRT_PRICE_OFFSET - WHIRLPOOL_HOT_FIELDS_OFFSET
+        tick_current_index_offset = WHIRLPOOL_TICK_CURRENT_INDEX_OFFSET - WHIRLPOOL_HOT_FIELDS_OFFSET
+        liquidity = int.from_bytes(data[:sqrt_price_offset], "little")
+        sqrt_price = int.from_bytes(data[sqrt_price_offset:tick_current_index_offset], "little")
+        tick_current_index = int.from_bytes(data[tick_current_index_offset:], "little", signed=True)
+        return liquidity, sqrt_price, tick_current_index
+
     @staticmethod
     def parse_whirlpools_config(data: bytes) -> Optional[AnchorWhirlpoolsConfig]:
         return safe_decode(AnchorWhirlpoolsConfig.decode, data)
@@ -52,6 +98,44 @@ class AccountParser:
     def parse_token_badge(data: bytes) -> Optional[AnchorTokenBadge]:
         return safe_decode(AnchorTokenBadge.decode, data)
 
+    @staticmethod
+    def parse_any(data: bytes, owner: Pubkey, program_id: Pubkey = ORCA_WHIRLPOOL_PROGRAM_ID) -> Optional[Tuple[AccountType, Any]]:
+        # dispatch by owner and length (token accounts) or discriminator (whirlpool accounts)
+        # every decoder is called only if data is long enough, so no exception is expected
+        if owner == TOKEN_PROGRAM_ID or owner == TOKEN_2022_PROGRAM_ID:
+            account_type = AccountParser._get_token_account_type(data, owner)
+            if account_type == AccountType.TokenMint:
+                return account_type, TokenUtil.deserialize_mint(data, owner)
+            if account_type == AccountType.TokenAccount:
+                return account_type, TokenUtil.deserialize_account(data, owner)
+            return None
+
+        # accounts of other anchor programs may have the same discriminator
+        if owner != program_id:
+            return None
+
+        decoder = ANCHOR_DECODERS.get(bytes(data[:ACCOUNT_DISCRIMINATOR_SIZE]))
+        if decoder is None:
+            return None
+        account_type, min_length, decode = decoder
+        if len(data) < min_length:
+            return None
+        return account_type, decode(data)
+
+    @staticmethod
+    def _get_token_account_type(data: bytes, owner: Pubkey) -> Optional[AccountType]:
+        if len(data) == MINT_LEN:
+            return AccountType.TokenMint
+        if len(data) == ACCOUNT_LEN:
+            return AccountType.TokenAccount
+        if owner == TOKEN_2022_PROGRAM_ID and len(data) > TOKEN_2022_ACCOUNT_TYPE_OFFSET:
+            token_2022_account_type = data[TOKEN_2022_ACCOUNT_TYPE_OFFSET]
+            if token_2022_account_type == TOKEN_2022_ACCOUNT_TYPE_MINT:
+                return AccountType.TokenMint
+            if token_2022_account_type == TOKEN_2022_ACCOUNT_TYPE_ACCOUNT:
+                return AccountType.TokenAccount
+        return None
+
     @staticmethod
     def parse_token_mint(data: bytes, program_id: Pubkey) -> Optional[SolanapyMintInfo]:
         return safe_decode(TokenUtil.deserialize_mint, data, program_id)
@@ -0,0 +1,135 @@
+from typing import List, Optional
+from anchorpy.coder.accounts import ACCOUNT_DISCRIMINATOR_SIZE
+from ..anchor.accounts import Whirlpool as AnchorWhirlpool, Position as AnchorPosition
+from ..constants import ACCOUNT_SIZE_WHIRLPOOL, ACCOUNT_SIZE_POSITION, NUM_REWARDS
+
+# numpy is optional (only required for columnar decoding)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _u128_fields(name: str, offset: int) -> list:
+    # u128 is split into lo/hi u64
+    return [(name + "_lo", "<u8", offset), (name + "_hi", "<u8", offset + 8)]
+
+
+def _pubkey_field(name: str, offset: int) -> list:
+    return [(name, ("u1", 32), offset)]
+
+
+def _build_dtype(fields: list, itemsize: int) -> "np.dtype":
+    return np.dtype({
+        "names": [f[0] for f in fields],
+        "formats": [f[1] for f in fields],
+        "offsets": [f[2] for f in fields],
+        "itemsize": itemsize,
+    })
+
+
+def _whirlpool_dtype() -> "np.dtype":
+    reward_info_fields = [
+        *_pubkey_field("mint", 0),
+        *_pubkey_field("vault", 32),
+        *_pubkey_field("authority", 64),
+        *_u128_fields("emissions_per_second_x64", 96),
+        *_u128_fields("growth_global_x64", 112),
+    ]
+    reward_info_dtype = _build_dtype(reward_info_fields, 128)
+    fields = [
+        ("discriminator", ("u1", ACCOUNT_DISCRIMINATOR_SIZE), 0),
+        *_pubkey_field("whirlpools_config", 8),
+        ("whirlpool_bump", "u1", 40),
+        ("tick_spacing", "<u2", 41),
+        ("tick_spacing_seed", ("u1", 2), 43),
+        ("fee_rate", "<u2", 45),
+        ("protocol_fee_rate", "<u2", 47),
+        *_u128_fields("liquidity", 49),
+        *_u128_fields("sqrt_price", 65),
+        ("tick_current_index", "<i4", 81),
+        ("protocol_fee_owed_a", "<u8", 85),
+        ("protocol_fee_owed_b", "<u8", 93),
+        *_pubkey_field("token_mint_a", 101),
+        *_pubkey_field("token_vault_a", 133),
+        *_u128_fields("fee_growth_global_a", 165),
+        *_pubkey_field("token_mint_b", 181),
+        *_pubkey_field("token_vault_b", 213),
+        *_u128_fields("fee_growth_global_b", 245),
+        ("reward_last_updated_timestamp", "<u8", 261),
+        ("reward_infos", (reward_info_dtype, (NUM_REWARDS,)), 269),
+    ]
+    return _build_dtype(fields, ACCOUNT_SIZE_WHIRLPOOL)
+
+
+def _position_dtype() -> "np.dtype":
+    reward_info_fields = [
+        *_u128_fields("growth_inside_checkpoint", 0),
+        ("amount_owed", "<u8", 16),
+    ]
+    reward_info_dtype = _build_dtype(reward_info_fields, 24)
+    fields = [
+        ("discriminator", ("u1", ACCOUNT_DISCRIMINATOR_SIZE), 0),
+        *_pubkey_field("whirlpool", 8),
+        *_pubkey_field("position_mint", 40),
+        *_u128_fields("liquidity", 72),
+        ("tick_lower_index", "<i4", 88),
+        ("tick_upper_index", "<i4", 92),
+        *_u128_fields("fee_growth_checkpoint_a", 96),
+        ("fee_owed_a", "<u8", 112),
+        *_u128_fields("fee_growth_checkpoint_b", 120),
+        ("fee_owed_b", "<u8", 136),
+        ("reward_infos", (reward_info_dtype, (NUM_REWARDS,)), 144),
+    ]
+    return _build_dtype(fields, ACCOUNT_SIZE_POSITION)
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for columnar decoding")
+
+
+class ColumnarDecoder:
+    # decode many accounts of one type into a numpy structured array in one pass
+    # u128 fields are split into <name>_lo and <name>_hi (u64), pubkeys are u1[32]
+    # invalid data (None, length or discriminator mismatch) is decoded as all zero row
+    _whirlpool_dtype: Optional["np.dtype"] = None
+    _position_dtype: Optional["np.dtype"] = None
+
+    @staticmethod
+    def decode_whirlpools(data: List[Optional[bytes]]) -> "np.ndarray":
+        _require_numpy()
+        if ColumnarDecoder._whirlpool_dtype is None:
+            ColumnarDecoder._whirlpool_dtype = _whirlpool_dtype()
+        return ColumnarDecoder._decode(data, AnchorWhirlpool.discriminator, ACCOUNT_SIZE_WHIRLPOOL, ColumnarDecoder._whirlpool_dtype)
+
+    @staticmethod
+    def decode_positions(data: List[Optional[bytes]]) -> "np.ndarray":
+        _require_numpy()
+        if ColumnarDecoder._position_dtype is None:
+            ColumnarDecoder._position_dtype = _position_dtype()
+        return ColumnarDecoder._decode(data, AnchorPosition.discriminator, ACCOUNT_SIZE_POSITION, ColumnarDecoder._position_dtype)
+
+    @staticmethod
+    def is_valid(records: "np.ndarray") -> "np.ndarray":
+        # rows for invalid data have zero discriminator
+        return records["discriminator"].any(axis=1)
+
+    @staticmethod
+    def to_u128(records: "np.ndarray", name: str) -> "np.ndarray":
+        # combine lo/hi into python int (object array)
+        _require_numpy()
+        hi = records[name + "_hi"].astype(object)
+        lo = records[name + "_lo"].astype(object)
+        return (hi << 64) | lo
+
+    @staticmethod
+    def _decode(data: List[Optional[bytes]], discriminator: bytes, size: int, dtype: "np.dtype") -> "np.ndarray":
+        empty = bytes(size)
+        chunks = []
+        for d in data:
+            if d is None or len(d) < size or d[:ACCOUNT_DISCRIMINATOR_SIZE] != discriminator:
+                chunks.append(empty)
+            else:
+                chunks.append(d[:size])
+        return np.frombuffer(b"".join(chunks), dtype=dtype)
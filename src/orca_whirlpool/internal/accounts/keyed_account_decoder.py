@@ -0,0 +1,209 @@
+import struct
+from typing import Optional
+from solders.pubkey import Pubkey
+from anchorpy.coder.accounts import ACCOUNT_DISCRIMINATOR_SIZE
+from ..anchor.accounts import Whirlpool as AnchorWhirlpool, Position as AnchorPosition
+from ..anchor.types import WhirlpoolRewardInfo, PositionRewardInfo
+from ..constants import ACCOUNT_SIZE_WHIRLPOOL, ACCOUNT_SIZE_POSITION, NUM_REWARDS
+from .types import Whirlpool, Position, TickArray
+from .tick_array_decoder import TickArrayDecoder
+
+# u128/i128 are read as 16 bytes
+# Whirlpool layout (after discriminator)
+_WHIRLPOOL_STRUCT = struct.Struct(
+    "<"
+    "32s"  # whirlpools_config
+    "B"    # whirlpool_bump
+    "H"    # tick_spacing
+    "2s"   # tick_spacing_seed
+    "H"    # fee_rate
+    "H"    # protocol_fee_rate
+    "16s"  # liquidity
+    "16s"  # sqrt_price
+    "i"    # tick_current_index
+    "Q"    # protocol_fee_owed_a
+    "Q"    # protocol_fee_owed_b
+    "32s"  # token_mint_a
+    "32s"  # token_vault_a
+    "16s"  # fee_growth_global_a
+    "32s"  # token_mint_b
+    "32s"  # token_vault_b
+    "16s"  # fee_growth_global_b
+    "Q"    # reward_last_updated_timestamp
+)
+_WHIRLPOOL_REWARD_INFO_STRUCT = struct.Struct(
+    "<"
+    "32s"  # mint
+    "32s"  # vault
+    "32s"  # authority
+    "16s"  # emissions_per_second_x64
+    "16s"  # growth_global_x64
+)
+_WHIRLPOOL_REWARD_INFOS_OFFSET = ACCOUNT_DISCRIMINATOR_SIZE + _WHIRLPOOL_STRUCT.size
+
+# Position layout (after discriminator)
+_POSITION_STRUCT = struct.Struct(
+    "<"
+    "32s"  # whirlpool
+    "32s"  # position_mint
+    "16s"  # liquidity
+    "i"    # tick_lower_index
+    "i"    # tick_upper_index
+    "16s"  # fee_growth_checkpoint_a
+    "Q"    # fee_owed_a
+    "16s"  # fee_growth_checkpoint_b
+    "Q"    # fee_owed_b
+)
+_POSITION_REWARD_INFO_STRUCT = struct.Struct(
+    "<"
+    "16s"  # growth_inside_checkpoint
+    "Q"    # amount_owed
+)
+_POSITION_REWARD_INFOS_OFFSET = ACCOUNT_DISCRIMINATOR_SIZE + _POSITION_STRUCT.size
+
+
+def _u128(b: bytes) -> int:
+    return int.from_bytes(b, "little")
+
+
+class KeyedAccountDecoder:
+    # decode account data directly into keyed types (no anchorpy object and no copy)
+    # invalid data (discriminator or length mismatch) is decoded as None
+    @staticmethod
+    def decode_whirlpool(pubkey: Pubkey, data: bytes) -> Optional[Whirlpool]:
+        if data[:ACCOUNT_DISCRIMINATOR_SIZE] != AnchorWhirlpool.discriminator or len(data) < ACCOUNT_SIZE_WHIRLPOOL:
+            return None
+
+        (
+            whirlpools_config,
+            whirlpool_bump,
+            tick_spacing,
+            tick_spacing_seed,
+            fee_rate,
+            protocol_fee_rate,
+            liquidity,
+            sqrt_price,
+            tick_current_index,
+            protocol_fee_owed_a,
+            protocol_fee_owed_b,
+            token_mint_a,
+            token_vault_a,
+            fee_growth_global_a,
+            token_mint_b,
+            token_vault_b,
+            fee_growth_global_b,
+            reward_last_updated_timestamp,
+        ) = _WHIRLPOOL_STRUCT.unpack_from(data, ACCOUNT_DISCRIMINATOR_SIZE)
+
+        reward_infos = []
+        for i in range(NUM_REWARDS):
+            mint, vault, authority, emissions_per_second_x64, growth_global_x64 = _WHIRLPOOL_REWARD_INFO_STRUCT.unpack_from(
+                data, _WHIRLPOOL_REWARD_INFOS_OFFSET + i * _WHIRLPOOL_REWARD_INFO_STRUCT.size
+            )
+            reward_infos.append(WhirlpoolRewardInfo(
+                mint=Pubkey.from_bytes(mint),
+                vault=Pubkey.from_bytes(vault),
+                authority=Pubkey.from_bytes(authority),
+                emissions_per_second_x64=_u128(emissions_per_second_x64),
+                growth_global_x64=_u128(growth_global_x64),
+            ))
+
+        return Whirlpool(
+            pubkey=pubkey,
+            whirlpools_config=Pubkey.from_bytes(whirlpools_config),
+            whirlpool_bump=[whirlpool_bump],
+            tick_spacing=tick_spacing,
+            tick_spacing_seed=list(tick_spacing_seed),
+            fee_rate=fee_rate,
+            protocol_fee_rate=protocol_fee_rate,
+            liquidity=_u128(liquidity),
+            sqrt_price=_u128(sqrt_price),
+            tick_current_index=tick_current_index,
+            protocol_fee_owed_a=protocol_fee_owed_a,
+            protocol_fee_owed_b=protocol_fee_owed_b,
+            token_mint_a=Pubkey.from_bytes(token_mint_a),
+            token_vault_a=Pubkey.from_bytes(token_vault_a),
+            fee_growth_global_a=_u128(fee_growth_global_a),
+            token_mint_b=Pubkey.from_bytes(token_mint_b),
+            token_vault_b=Pubkey.from_bytes(token_vault_b),
+            fee_growth_global_b=_u128(fee_growth_global_b),
+            reward_last_updated_timestamp=reward_last_updated_timestamp,
+            reward_infos=reward_infos,
+        )
+
+    @staticmethod
+    def decode_position(pubkey: Pubkey, data: bytes) -> Optional[Position]:
+        if data[:ACCOUNT_DISCRIMINATOR_SIZE] != AnchorPosition.discriminator or len(data) < ACCOUNT_SIZE_POSITION:
+            return None
+
+        (
+            whirlpool,
+            position_mint,
+            liquidity,
+            tick_lower_index,
+            tick_upper_index,
+            fee_growth_checkpoint_a,
+            fee_owed_a,
+            fee_growth_checkpoint_b,
+            fee_owed_b,
+        ) = _POSITION_STRUCT.unpack_from(data, ACCOUNT_DISCRIMINATOR_SIZE)
+
+        reward_infos = []
+        for i in range(NUM_REWARDS):
+            growth_inside_checkpoint, amount_owed = _POSITION_REWARD_INFO_STRUCT.unpack_from(
+                data, _POSITION_REWARD_INFOS_OFFSET + i * _POSITION_REWARD_INFO_STRUCT.size
+            )
+            reward_infos.append(PositionRewardInfo(
+                growth_inside_checkpoint=_u128(growth_inside_checkpoint),
+                amount_owed=amount_owed,
+            ))
+
+        return Position(
+            pubkey=pubkey,
+            whirlpool=Pubkey.from_bytes(whirlpool),
+            position_mint=Pubkey.from_bytes(position_mint),
+            liquidity=_u128(liquidity),
+            tick_lower_index=tick_lower_index,
+            tick_upper_index=tick_upper_index,
+            fee_growth_checkpoint_a=_u128(fee_growth_checkpoint_a),
+            fee_owed_a=fee_owed_a,
+            fee_growth_checkpoint_b=_u128(fee_growth_checkpoint_b),
+            fee_owed_b=fee_owed_b,
+            reward_infos=reward_infos,
+        )
+
+    @staticmethod
+    def decode_tick_array(pubkey: Pubkey, data: bytes) -> Optional[TickArray]:
+        if not TickArrayDecoder.is_valid(data):
+            return None
+        start_tick_index, whirlpool = TickArrayDecoder.decode_header(data)
+        return TickArray(
+            pubkey=pubkey,
+            start_tick_index=start_tick_index,
+            ticks=TickArrayDecoder.decode_ticks(data),
+            whirlpool=whirlpool,
+        )
+
+    @staticmethod
+    def decode_tick_array_lazy(pubkey: Pubkey, data: bytes) -> Optional[TickArray]:
+        if not TickArrayDecoder.is_valid(data):
+            return None
+        start_tick_index, whirlpool = TickArrayDecoder.decode_header(data)
+        return TickArray(
+            pubkey=pubkey,
+            start_tick_index=start_tick_index,
+            ticks=TickArrayDecoder.decode_ticks_lazy(data),
+            whirlpool=whirlpool,
+        )
+
+    @staticmethod
+    def decode_tick_array_sparse(pubkey: Pubkey, data: bytes) -> Optional[TickArray]:
+        if not TickArrayDecoder.is_valid(data):
+            return None
+        start_tick_index, whirlpool = TickArrayDecoder.decode_header(data)
+        return TickArray(
+            pubkey=pubkey,
+            start_tick_index=start_tick_index,
+            ticks=TickArrayDecoder.decode_ticks_sparse(data),
+            whirlpool=whirlpool,
+        )
@@ -0,0 +1,212 @@
+import struct
+from abc import abstractmethod
+from bisect import bisect_left
+from collections.abc import Sequence
+from typing import List, Optional, Tuple, Union
+from solders.pubkey import Pubkey
+from anchorpy.coder.accounts import ACCOUNT_DISCRIMINATOR_SIZE
+from anchorpy.error import AccountInvalidDiscriminator
+from ..anchor.accounts import TickArray as AnchorTickArray
+from ..anchor.types import Tick as AnchorTick
+from ..constants import TICK_ARRAY_SIZE, ACCOUNT_SIZE_TICK_ARRAY
+
+# TickArray layout
+# discriminator(8) + start_tick_index(i32) + ticks(Tick * 88) + whirlpool(32)
+# Tick layout
+# initialized(bool) + liquidity_net(i128) + liquidity_gross(u128)
+#   + fee_growth_outside_a(u128) + fee_growth_outside_b(u128) + reward_growths_outside(u128 * 3)
+TICK_ARRAY_START_TICK_INDEX_OFFSET = ACCOUNT_DISCRIMINATOR_SIZE
+TICK_ARRAY_TICKS_OFFSET = TICK_ARRAY_START_TICK_INDEX_OFFSET + 4
+TICK_SIZE = 1 + 16 * 7
+TICK_ARRAY_WHIRLPOOL_OFFSET = TICK_ARRAY_TICKS_OFFSET + TICK_SIZE * TICK_ARRAY_SIZE
+
+# u128/i128 are read as (lo: u64, hi: u64) pairs
+_TICK_STRUCT = struct.Struct("<B" + "QQ" * 7)
+_START_TICK_INDEX_STRUCT = struct.Struct("<i")
+_ZERO_TICK = bytes(TICK_SIZE)
+# shared by SparseTickList for all zero ticks (must not be mutated)
+_ZERO_ANCHOR_TICK = AnchorTick(False, 0, 0, 0, 0, [0, 0, 0])
+_U64_BITS = 64
+_I128_SIGN = 1 << 127
+_U128_MODULUS = 1 << 128
+
+
+class TickArrayDecoder:
+    @staticmethod
+    def decode(data: bytes) -> AnchorTickArray:
+        # equivalent to AnchorTickArray.decode, but reads fields at fixed offsets without borsh
+        TickArrayDecoder._validate(data)
+        start_tick_index, whirlpool = TickArrayDecoder.decode_header(data)
+        return AnchorTickArray(
+            start_tick_index=start_tick_index,
+            ticks=TickArrayDecoder.decode_ticks(data),
+            whirlpool=whirlpool,
+        )
+
+    @staticmethod
+    def is_valid(data: bytes) -> bool:
+        return data[:ACCOUNT_DISCRIMINATOR_SIZE] == AnchorTickArray.discriminator and len(data) >= ACCOUNT_SIZE_TICK_ARRAY
+
+    @staticmethod
+    def _validate(data: bytes):
+        if data[:ACCOUNT_DISCRIMINATOR_SIZE] != AnchorTickArray.discriminator:
+            raise AccountInvalidDiscriminator("The discriminator for this account is invalid")
+        if len(data) < ACCOUNT_SIZE_TICK_ARRAY:
+            raise ValueError("data is too short for TickArray")
+
+    @staticmethod
+    def decode_header(data: bytes) -> Tuple[int, Pubkey]:
+        # start_tick_index and whirlpool
+        start_tick_index = _START_TICK_INDEX_STRUCT.unpack_from(data, TICK_ARRAY_START_TICK_INDEX_OFFSET)[0]
+        whirlpool = Pubkey.from_bytes(bytes(data[TICK_ARRAY_WHIRLPOOL_OFFSET:(TICK_ARRAY_WHIRLPOOL_OFFSET+32)]))
+        return start_tick_index, whirlpool
+
+    @staticmethod
+    def decode_ticks(data: bytes) -> List[AnchorTick]:
+        buffer = memoryview(data)
+        return [
+            TickArrayDecoder.decode_tick(buffer, TICK_ARRAY_TICKS_OFFSET + i * TICK_SIZE)
+            for i in range(TICK_ARRAY_SIZE)
+        ]
+
+    @staticmethod
+    def decode_ticks_lazy(data: bytes) -> "LazyTickList":
+        # ticks are decoded on access
+        return LazyTickList(data)
+
+    @staticmethod
+    def decode_ticks_sparse(data: bytes) -> "SparseTickList":
+        # only non-zero (initialized) ticks are kept
+        buffer = memoryview(data)
+        offsets = []
+        ticks = []
+        for i in range(TICK_ARRAY_SIZE):
+            offset = TICK_ARRAY_TICKS_OFFSET + i * TICK_SIZE
+            if buffer[offset:(offset+TICK_SIZE)] == _ZERO_TICK:
+                continue
+            offsets.append(i)
+            ticks.append(TickArrayDecoder.decode_tick(buffer, offset))
+        return SparseTickList(offsets, ticks)
+
+    @staticmethod
+    def decode_tick(buffer: memoryview, offset: int) -> AnchorTick:
+        # most ticks are not initialized (all zero)
+        if buffer[offset:(offset+TICK_SIZE)] == _ZERO_TICK:
+            return AnchorTick(False, 0, 0, 0, 0, [0, 0, 0])
+
+        (
+            initialized,
+            liquidity_net_lo, liquidity_net_hi,
+            liquidity_gross_lo, liquidity_gross_hi,
+            fee_growth_outside_a_lo, fee_growth_outside_a_hi,
+            fee_growth_outside_b_lo, fee_growth_outside_b_hi,
+            reward0_lo, reward0_hi,
+            reward1_lo, reward1_hi,
+            reward2_lo, reward2_hi,
+        ) = _TICK_STRUCT.unpack_from(buffer, offset)
+
+        liquidity_net = (liquidity_net_hi << _U64_BITS) | liquidity_net_lo
+        if liquidity_net >= _I128_SIGN:
+            liquidity_net -= _U128_MODULUS
+
+        return AnchorTick(
+            initialized != 0,
+            liquidity_net,
+            (liquidity_gross_hi << _U64_BITS) | liquidity_gross_lo,
+            (fee_growth_outside_a_hi << _U64_BITS) | fee_growth_outside_a_lo,
+            (fee_growth_outside_b_hi << _U64_BITS) | fee_growth_outside_b_lo,
+            [
+                (reward0_hi << _U64_BITS) | reward0_lo,
+                (reward1_hi << _U64_BITS) | reward1_lo,
+                (reward2_hi << _U64_BITS) | reward2_lo,
+            ],
+        )
+
+
+class TickList(Sequence):
+    # read-only list of 88 ticks that can answer is_initialized without building Tick objects
+    # (abstract, Sequence is an ABC)
+    def __len__(self) -> int:
+        return TICK_ARRAY_SIZE
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[AnchorTick, List[AnchorTick]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(TICK_ARRAY_SIZE))]
+        if index < 0:
+            index += TICK_ARRAY_SIZE
+        if not 0 <= index < TICK_ARRAY_SIZE:
+            raise IndexError("tick index out of range")
+        return self._get_tick(index)
+
+    @abstractmethod
+    def _get_tick(self, index: int) -> AnchorTick:
+        pass
+
+    @abstractmethod
+    def is_initialized(self, index: int) -> bool:
+        pass
+
+    def get_initialized_offsets(self) -> List[int]:
+        # ascending order
+        return [i for i in range(TICK_ARRAY_SIZE) if self.is_initialized(i)]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or len(other) != TICK_ARRAY_SIZE:
+            return False
+        return all(self[i] == other[i] for i in range(TICK_ARRAY_SIZE))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return "{}({})".format(type(self).__name__, list(self))
+
+
+class LazyTickList(TickList):
+    # list of ticks backed by raw TickArray account data
+    # each tick is decoded on first access and memoized
+    def __init__(self, data: bytes):
+        self._data = data
+        self._ticks: List[Optional[AnchorTick]] = [None] * TICK_ARRAY_SIZE
+
+    def _get_tick(self, index: int) -> AnchorTick:
+        tick = self._ticks[index]
+        if tick is None:
+            tick = TickArrayDecoder.decode_tick(memoryview(self._data), TICK_ARRAY_TICKS_OFFSET + index * TICK_SIZE)
+            self._ticks[index] = tick
+        return tick
+
+    def is_initialized(self, index: int) -> bool:
+        # only the 1-byte initialized flag is read
+        if not 0 <= index < TICK_ARRAY_SIZE:
+            raise IndexError("tick index out of range")
+        return self._data[TICK_ARRAY_TICKS_OFFSET + index * TICK_SIZE] != 0
+
+
+class SparseTickList(TickList):
+    # sorted offsets + non-zero ticks
+    # zero ticks (uninitialized) are not stored and share one read-only instance
+    def __init__(self, offsets: List[int], ticks: List[AnchorTick]):
+        self._offsets = bytes(offsets)
+        self._ticks: Tuple[AnchorTick, ...] = tuple(ticks)
+        self._initialized: Tuple[bool, ...] = tuple(t.initialized for t in ticks)
+
+    def _find(self, index: int) -> Optional[int]:
+        pos = bisect_left(self._offsets, index)
+        if pos < len(self._offsets) and self._offsets[pos] == index:
+            return pos
+        return None
+
+    def _get_tick(self, index: int) -> AnchorTick:
+        pos = self._find(index)
+        if pos is None:
+            return _ZERO_ANCHOR_TICK
+        return self._ticks[pos]
+
+    def is_initialized(self, index: int) -> bool:
+        if not 0 <= index < TICK_ARRAY_SIZE:
+            raise IndexError("tick index out of range")
+        pos = self._find(index)
+        return pos is not None and self._initialized[pos]
+
+    def get_initialized_offsets(self) -> List[int]:
+        return [offset for offset, initialized in zip(self._offsets, self._initialized) if initialized]
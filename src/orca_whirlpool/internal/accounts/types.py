@@ -1,7 +1,9 @@
 import dataclasses
-from typing import Optional
+from typing import Optional, Tuple
 from solders.pubkey import Pubkey
 from ..anchor.types import WhirlpoolRewardInfo, Tick, PositionRewardInfo
+from .tick_array_decoder import TickList
+from ..utils.token_extension_util import TokenExtensions, TokenExtensionUtil
 
 
 @dataclasses.dataclass(frozen=True)
@@ -25,7 +27,7 @@ class FeeTier:
     default_fee_rate: int
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Whirlpool:
     # keyed
     pubkey: Pubkey
@@ -51,17 +53,37 @@ class Whirlpool:
     reward_infos: list[WhirlpoolRewardInfo]
 
 
-@dataclasses.dataclass(frozen=True)
-class TickArray:
+class _InitializedOffsetsMemo:
+    # offsets of initialized ticks are memoized in a slot, not in a dataclass field (excluded from fields/asdict/eq)
+    # the memo assumes ticks is never mutated in place (use dataclasses.replace to get a new TickArray with a fresh memo)
+    __slots__ = ("_initialized_offsets",)
+
+    @property
+    def initialized_offsets(self) -> Tuple[int, ...]:
+        # ascending order
+        offsets = getattr(self, "_initialized_offsets", None)
+        if offsets is None:
+            if isinstance(self.ticks, TickList):
+                # uninitialized ticks are not built
+                offsets = tuple(self.ticks.get_initialized_offsets())
+            else:
+                offsets = tuple(i for i, tick in enumerate(self.ticks) if tick.initialized)
+            object.__setattr__(self, "_initialized_offsets", offsets)
+        return offsets
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class TickArray(_InitializedOffsetsMemo):
     # keyed
     pubkey: Pubkey
     # TickArray
     start_tick_index: int
+    # read-only (initialized_offsets is memoized)
     ticks: list[Tick]
     whirlpool: Pubkey
 
 
-@dataclasses.dataclass(frozen=True)
+@dataclasses.dataclass(frozen=True, slots=True)
 class Position:
     # keyed
     pubkey: Pubkey
@@ -106,8 +128,21 @@ class TokenBadge:
     token_mint: Pubkey
 
 
-@dataclasses.dataclass(frozen=True)
-class AccountInfo:
+class _TokenExtensionsMemo:
+    # parsed tlv_data is memoized in a slot, not in a dataclass field (excluded from fields/asdict/eq)
+    __slots__ = ("_extensions",)
+
+    @property
+    def extensions(self) -> TokenExtensions:
+        extensions = getattr(self, "_extensions", None)
+        if extensions is None:
+            extensions = TokenExtensionUtil.parse(self.tlv_data)
+            object.__setattr__(self, "_extensions", extensions)
+        return extensions
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class AccountInfo(_TokenExtensionsMemo):
     # keyed
     pubkey: Pubkey
     # token program id
@@ -125,8 +160,8 @@ class AccountInfo:
     tlv_data: bytes
 
 
-@dataclasses.dataclass(frozen=True)
-class MintInfo:
+@dataclasses.dataclass(frozen=True, slots=True)
+class MintInfo(_TokenExtensionsMemo):
     # keyed
     pubkey: Pubkey
     # token program id
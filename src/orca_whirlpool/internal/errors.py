@@ -31,6 +31,10 @@ class SwapErrorCode(WhirlpoolErrorCode):
     TickArray0MustBeInitialized = "TickArray0MustBeInitialized"
 
 
+class AccountFetcherErrorCode(WhirlpoolErrorCode):
+    InconsistentSnapshotSlot = "InconsistentSnapshotSlot"
+
+
 class WhirlpoolError(Exception):
     def __init__(self, error_code: WhirlpoolErrorCode, message: str = None):
         if message is not None:
@@ -8,8 +8,8 @@ from .swap import SwapQuote, SwapQuoteParams, swap_quote_with_params
 
 class QuoteBuilder:
     @staticmethod
-    def swap(params: SwapQuoteParams, tick_array_reduction: TickArrayReduction = TickArrayReduction.No) -> SwapQuote:
-        return swap_quote_with_params(params, tick_array_reduction)
+    def swap(params: SwapQuoteParams, tick_array_reduction: TickArrayReduction = TickArrayReduction.No, use_sqrt_price_table: bool = False) -> SwapQuote:
+        return swap_quote_with_params(params, tick_array_reduction, use_sqrt_price_table)
 
     @staticmethod
     def increase_liquidity_by_input_token(params: IncreaseLiquidityQuoteParams) -> IncreaseLiquidityQuote:
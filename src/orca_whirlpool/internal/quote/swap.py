@@ -6,8 +6,9 @@ from .swap_simulator.swap_simulator import simulate_swap
 def swap_quote_with_params(
     params: SwapQuoteParams,
     tick_array_reduction: TickArrayReduction,
+    use_sqrt_price_table: bool = False,
 ) -> SwapQuote:
-    quote = simulate_swap(params, tick_array_reduction)
+    quote = simulate_swap(params, tick_array_reduction, use_sqrt_price_table)
 
     if params.specified_amount.is_swap_input:
         other_amount_threshold = params.slippage_tolerance.adjust_sub(quote.estimated_amount_out)
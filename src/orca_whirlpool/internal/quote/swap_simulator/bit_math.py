@@ -1,6 +1,11 @@
 from ...errors import WhirlpoolError, MathErrorCode
 
 
+U128_MAX = 2**128 - 1
+U256_MAX = 2**256 - 1
+ULIMIT_MAX = {128: U128_MAX, 256: U256_MAX}
+
+
 class BitMath:
     @staticmethod
     def mul(n0: int, n1: int, limit: int) -> int:
@@ -46,5 +51,7 @@ class BitMath:
 
     @staticmethod
     def is_over_limit(n0: int, limit: int) -> bool:
-        ulimit_max = 2**limit - 1
+        ulimit_max = ULIMIT_MAX.get(limit)
+        if ulimit_max is None:
+            ulimit_max = 2**limit - 1
         return n0 > ulimit_max
@@ -1,10 +1,11 @@
 import dataclasses
+from typing import Callable, Dict, Tuple
 from ...errors import WhirlpoolError, SwapErrorCode, MathErrorCode
 from ...types.enums import SwapDirection, SpecifiedAmount
 from ...utils.liquidity_math import LiquidityMath
 from ...utils.q64_fixed_point_math import Q64FixedPointMath
 from ...constants import FEE_RATE_MUL_VALUE, MIN_SQRT_PRICE, MAX_SQRT_PRICE
-from .bit_math import BitMath
+from .bit_math import BitMath, U128_MAX, U256_MAX
 
 
 @dataclasses.dataclass(frozen=True)
@@ -175,3 +176,123 @@ def compute_swap_step(
         next_sqrt_price=next_sqrt_price,
         fee_amount=fee_amount,
     )
+
+
+# fast path of compute_swap_step
+# specialized for each (specified_amount, direction) combination and returns a tuple instead of SwapStep
+# (amount_in, amount_out, next_sqrt_price, fee_amount)
+SwapStepTuple = Tuple[int, int, int, int]
+ComputeSwapStepFunc = Callable[[int, int, int, int, int], SwapStepTuple]
+
+SHIFT_X64 = 2**64
+
+
+def make_compute_swap_step(specified_amount: SpecifiedAmount, direction: SwapDirection) -> ComputeSwapStepFunc:
+    is_swap_input = specified_amount.is_swap_input
+    is_fixed_a = specified_amount.is_a(direction)
+    if is_fixed_a:
+        get_fixed_amount_delta = LiquidityMath.get_token_a_from_liquidity
+        get_unfixed_amount_delta = LiquidityMath.get_token_b_from_liquidity
+    else:
+        get_fixed_amount_delta = LiquidityMath.get_token_b_from_liquidity
+        get_unfixed_amount_delta = LiquidityMath.get_token_a_from_liquidity
+    # round up fixed amount for input, unfixed amount for output
+    fixed_round_up = is_swap_input
+    unfixed_round_up = not is_swap_input
+
+    def get_next_sqrt_price_from_a(sqrt_price: int, liquidity: int, amount: int) -> int:
+        # see get_next_sqrt_price_from_a_round_up
+        if amount == 0:
+            return sqrt_price
+
+        numerator = liquidity * sqrt_price * SHIFT_X64
+        if numerator > U256_MAX:
+            raise WhirlpoolError(MathErrorCode.MultiplicationOverflow)
+
+        liquidity_x64 = liquidity * SHIFT_X64
+        amount_sqrt_price = amount * sqrt_price
+        if is_swap_input:
+            denominator = liquidity_x64 + amount_sqrt_price
+        else:
+            if amount_sqrt_price >= liquidity_x64:
+                raise WhirlpoolError(MathErrorCode.DivideByZero)
+            denominator = liquidity_x64 - amount_sqrt_price
+
+        next_sqrt_price, remainder = divmod(numerator, denominator)
+        if remainder != 0:
+            next_sqrt_price += 1
+        if next_sqrt_price < MIN_SQRT_PRICE:
+            raise WhirlpoolError(SwapErrorCode.SqrtPriceMinSubceeded)
+        if next_sqrt_price > MAX_SQRT_PRICE:
+            raise WhirlpoolError(SwapErrorCode.SqrtPriceMaxExceeded)
+        return next_sqrt_price
+
+    def get_next_sqrt_price_from_b(sqrt_price: int, liquidity: int, amount: int) -> int:
+        # see get_next_sqrt_price_from_b_round_down
+        if liquidity == 0:
+            raise WhirlpoolError(MathErrorCode.DivideByZero)
+        delta, remainder = divmod(amount * SHIFT_X64, liquidity)
+        if is_swap_input:
+            return sqrt_price + delta
+        if remainder != 0:
+            delta += 1
+        return sqrt_price - delta
+
+    get_next_sqrt_price = get_next_sqrt_price_from_a if is_fixed_a else get_next_sqrt_price_from_b
+
+    def compute_swap_step_fast(
+        remaining_amount: int,
+        fee_rate: int,
+        liquidity: int,
+        sqrt_price: int,
+        target_sqrt_price: int,
+    ) -> SwapStepTuple:
+        fee_rate_denominator = FEE_RATE_MUL_VALUE - fee_rate
+        if is_swap_input:
+            # get_fee_less_amount
+            p = remaining_amount * fee_rate_denominator
+            if p > U128_MAX:
+                raise WhirlpoolError(MathErrorCode.MultiplicationOverflow)
+            consumable_amount = p // FEE_RATE_MUL_VALUE
+        else:
+            consumable_amount = remaining_amount
+
+        fixed_amount_delta = get_fixed_amount_delta(liquidity, sqrt_price, target_sqrt_price, fixed_round_up)
+        if consumable_amount >= fixed_amount_delta:
+            is_max_swap = True
+            next_sqrt_price = target_sqrt_price
+        else:
+            is_max_swap = False
+            next_sqrt_price = get_next_sqrt_price(sqrt_price, liquidity, consumable_amount)
+            fixed_amount_delta = get_fixed_amount_delta(liquidity, sqrt_price, next_sqrt_price, fixed_round_up)
+
+        unfixed_amount_delta = get_unfixed_amount_delta(liquidity, sqrt_price, next_sqrt_price, unfixed_round_up)
+        if is_swap_input:
+            amount_in = fixed_amount_delta
+            amount_out = unfixed_amount_delta
+            if not is_max_swap:
+                return amount_in, amount_out, next_sqrt_price, remaining_amount - amount_in
+        else:
+            amount_in = unfixed_amount_delta
+            # cap for exact out swap
+            amount_out = min(fixed_amount_delta, remaining_amount)
+
+        # get_fee_amount
+        if fee_rate_denominator == 0:
+            raise WhirlpoolError(MathErrorCode.DivideByZero)
+        p = amount_in * fee_rate
+        if p > U128_MAX:
+            raise WhirlpoolError(MathErrorCode.MultiplicationOverflow)
+        fee_amount, remainder = divmod(p, fee_rate_denominator)
+        if remainder != 0:
+            fee_amount += 1
+        return amount_in, amount_out, next_sqrt_price, fee_amount
+
+    return compute_swap_step_fast
+
+
+COMPUTE_SWAP_STEP_FAST: Dict[Tuple[SpecifiedAmount, SwapDirection], ComputeSwapStepFunc] = {
+    (specified_amount, direction): make_compute_swap_step(specified_amount, direction)
+    for specified_amount in SpecifiedAmount
+    for direction in SwapDirection
+}
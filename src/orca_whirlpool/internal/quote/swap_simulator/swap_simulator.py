@@ -6,7 +6,7 @@ from ...utils.price_math import PriceMath
 from ...constants import MIN_SQRT_PRICE, MAX_SQRT_PRICE, MAX_SWAP_TICK_ARRAYS
 from .tick_array_sequence import TickArraySequence
 from .types import SwapQuoteParams, SwapQuote
-from .swap_math import compute_swap_step
+from .swap_math import compute_swap_step, COMPUTE_SWAP_STEP_FAST
 
 
 @dataclasses.dataclass(frozen=True)
@@ -94,7 +94,98 @@ def compute_swap(
     )
 
 
-def simulate_swap(params: SwapQuoteParams, tick_array_reduction: TickArrayReduction) -> SwapQuote:
+def compute_swap_fast(
+    whirlpool: Whirlpool,
+    tick_array_sequence: TickArraySequence,
+    amount: int,
+    sqrt_price_limit: int,
+    specified_amount: SpecifiedAmount,
+    direction: SwapDirection,
+    use_sqrt_price_table: bool = False,
+) -> SwapResult:
+    # same result as compute_swap
+    # enum properties and lookups are hoisted out of the loop, and each step is returned as a tuple
+    compute_swap_step_fast = COMPUTE_SWAP_STEP_FAST[(specified_amount, direction)]
+    get_next_initialized_tick_index = tick_array_sequence.get_next_initialized_tick_index
+    get_tick = tick_array_sequence.get_tick
+    # boundaries are initializable ticks, so they are looked up from the precomputed table if it has been built
+    table = PriceMath.get_sqrt_price_table(whirlpool.tick_spacing) if use_sqrt_price_table else None
+    if table is not None:
+        tick_index_to_sqrt_price_x64 = table.get
+    else:
+        tick_index_to_sqrt_price_x64 = PriceMath.tick_index_to_sqrt_price_x64
+    sqrt_price_x64_to_tick_index = PriceMath.sqrt_price_x64_to_tick_index
+    is_swap_input = specified_amount.is_swap_input
+    is_a_to_b = direction.is_a_to_b
+
+    remaining_amount = amount
+    calculated_amount = 0
+
+    current_sqrt_price = whirlpool.sqrt_price
+    current_liquidity = whirlpool.liquidity
+    current_tick_index = whirlpool.tick_current_index
+
+    fee_rate = whirlpool.fee_rate
+    total_fee_amount = 0
+
+    while remaining_amount > 0 and current_sqrt_price != sqrt_price_limit:
+        next_tick_index = get_next_initialized_tick_index(current_tick_index)
+        next_sqrt_price = tick_index_to_sqrt_price_x64(next_tick_index)
+
+        # price down if a to b
+        if is_a_to_b:
+            target_sqrt_price = next_sqrt_price if next_sqrt_price > sqrt_price_limit else sqrt_price_limit
+        else:
+            target_sqrt_price = next_sqrt_price if next_sqrt_price < sqrt_price_limit else sqrt_price_limit
+
+        amount_in, amount_out, step_sqrt_price, fee_amount = compute_swap_step_fast(
+            remaining_amount,
+            fee_rate,
+            current_liquidity,
+            current_sqrt_price,
+            target_sqrt_price,
+        )
+
+        total_fee_amount += fee_amount
+        if is_swap_input:
+            remaining_amount -= amount_in + fee_amount
+            calculated_amount += amount_out
+        else:
+            remaining_amount -= amount_out
+            calculated_amount += amount_in + fee_amount
+
+        if step_sqrt_price != next_sqrt_price:
+            current_tick_index = sqrt_price_x64_to_tick_index(step_sqrt_price)
+        else:
+            next_tick = get_tick(next_tick_index)
+            if is_a_to_b:
+                if next_tick.initialized:
+                    current_liquidity -= next_tick.liquidity_net
+                current_tick_index = next_tick_index - 1
+            else:
+                if next_tick.initialized:
+                    current_liquidity += next_tick.liquidity_net
+                current_tick_index = next_tick_index
+
+        current_sqrt_price = step_sqrt_price
+
+    if is_swap_input == is_a_to_b:
+        amount_a = amount - remaining_amount
+        amount_b = calculated_amount
+    else:
+        amount_a = calculated_amount
+        amount_b = amount - remaining_amount
+
+    return SwapResult(
+        amount_a=amount_a,
+        amount_b=amount_b,
+        next_tick_index=current_tick_index,
+        next_sqrt_price=current_sqrt_price,
+        fee_amount=total_fee_amount,
+    )
+
+
+def simulate_swap(params: SwapQuoteParams, tick_array_reduction: TickArrayReduction, use_sqrt_price_table: bool = False) -> SwapQuote:
     whirlpool = params.whirlpool
     amount = params.amount
     sqrt_price_limit = params.sqrt_price_limit
@@ -120,13 +211,14 @@ def simulate_swap(params: SwapQuoteParams, tick_array_reduction: TickArrayReduct
         MAX_SWAP_TICK_ARRAYS,
     )
 
-    result = compute_swap(
+    result = compute_swap_fast(
         whirlpool,
         tick_array_sequence,
         amount,
         sqrt_price_limit,
         specified_amount,
         direction,
+        use_sqrt_price_table,
     )
 
     if specified_amount.is_swap_input:
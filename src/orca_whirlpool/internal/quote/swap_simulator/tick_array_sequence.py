@@ -1,4 +1,5 @@
 import dataclasses
+from bisect import bisect_left, bisect_right
 from typing import List, Optional
 from solders.pubkey import Pubkey
 from ...invariant import invariant
@@ -41,20 +42,22 @@ def get_initialized_ticks(
     start_tick_index = tick_array.start_tick_index
     last_tick_index_appended = False
 
+    # memoized on tick_array, so it is reused across quotes
+    ticks = tick_array.ticks
+    initialized_offsets = tick_array.initialized_offsets
+
     if direction.is_price_up:
         last_tick_index = min(start_tick_index + tick_spacing * TICK_ARRAY_SIZE - 1, MAX_TICK_INDEX)
-        ticks = list(enumerate(tick_array.ticks))
     else:
         last_tick_index = max(start_tick_index, MIN_TICK_INDEX)
-        ticks = reversed(list(enumerate(tick_array.ticks)))
+        initialized_offsets = reversed(initialized_offsets)
 
     initialized_ticks = []
-    for i, tick in ticks:
-        if tick.initialized:
-            tick_index = start_tick_index + i*tick_spacing
-            initialized_ticks.append(InitializedTick(tick_index, tick_array_index, tick))
-            if tick_index == last_tick_index:
-                last_tick_index_appended = True
+    for i in initialized_offsets:
+        tick_index = start_tick_index + i*tick_spacing
+        initialized_ticks.append(InitializedTick(tick_index, tick_array_index, ticks[i]))
+        if tick_index == last_tick_index:
+            last_tick_index_appended = True
 
     if not has_next and not last_tick_index_appended:
         initialized_ticks.append(InitializedTick(last_tick_index, tick_array_index, Tick(False, 0, 0, 0, 0, [])))
@@ -105,21 +108,31 @@ class TickArraySequence:
                 has_next,
             ))
 
-    def get_next_initialized_tick_index(self, current_tick_index: int) -> int:
+        # sorted index for lookup
+        # price up: initialized_ticks is ascending, price down: descending (keys are negated to be ascending)
+        if self.direction.is_price_up:
+            self._search_keys = [tick.tick_index for tick in self.initialized_ticks]
+        else:
+            self._search_keys = [-tick.tick_index for tick in self.initialized_ticks]
+        self._ticks_by_index = {}
         for tick in self.initialized_ticks:
-            if self.direction.is_price_up and tick.tick_index > current_tick_index:  # not inclusive
-                self.max_touched_tick_array_index = max(self.max_touched_tick_array_index, tick.tick_array_index)
-                return tick.tick_index
-            if self.direction.is_price_down and tick.tick_index <= current_tick_index:  # inclusive
-                self.max_touched_tick_array_index = max(self.max_touched_tick_array_index, tick.tick_array_index)
-                return tick.tick_index
-        raise WhirlpoolError(SwapErrorCode.TickArraySequenceInvalid)
+            self._ticks_by_index.setdefault(tick.tick_index, tick.data)
+
+    def get_next_initialized_tick_index(self, current_tick_index: int) -> int:
+        if self.direction.is_price_up:
+            i = bisect_right(self._search_keys, current_tick_index)  # not inclusive
+        else:
+            i = bisect_left(self._search_keys, -current_tick_index)  # inclusive
+        if i >= len(self.initialized_ticks):
+            raise WhirlpoolError(SwapErrorCode.TickArraySequenceInvalid)
+        tick = self.initialized_ticks[i]
+        self.max_touched_tick_array_index = max(self.max_touched_tick_array_index, tick.tick_array_index)
+        return tick.tick_index
 
     def get_tick(self, tick_index: int) -> Tick:
-        for tick in self.initialized_ticks:
-            if tick.tick_index == tick_index:
-                return tick.data
-        invariant(False, "unreachable - tick_index is not in initialized_ticks")
+        tick = self._ticks_by_index.get(tick_index)
+        invariant(tick is not None, "unreachable - tick_index is not in initialized_ticks")
+        return tick
 
     def get_tick_array_pubkeys(self, reduction: TickArrayReduction) -> List[Pubkey]:
         # reduction
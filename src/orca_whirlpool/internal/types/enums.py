@@ -53,6 +53,25 @@ class TickArrayReduction(str, Enum):
     Aggressive = "Aggressive"
 
 
+class TickArrayDecoding(str, Enum):
+    Eager = "Eager"
+    Lazy = "Lazy"
+    Sparse = "Sparse"
+
+
+class AccountType(str, Enum):
+    WhirlpoolsConfig = "WhirlpoolsConfig"
+    FeeTier = "FeeTier"
+    Whirlpool = "Whirlpool"
+    TickArray = "TickArray"
+    Position = "Position"
+    PositionBundle = "PositionBundle"
+    WhirlpoolsConfigExtension = "WhirlpoolsConfigExtension"
+    TokenBadge = "TokenBadge"
+    TokenAccount = "TokenAccount"
+    TokenMint = "TokenMint"
+
+
 class RemainingAccountsType(str, Enum):
     TransferHookA = "TransferHookA"
     TransferHookB = "TransferHookB"
@@ -1,4 +1,5 @@
 import dataclasses
+from typing import Any, List, Optional
 from solders.pubkey import Pubkey
 from ..transaction.types import Instruction
 
@@ -25,3 +26,9 @@ class PublicKeyWithInstruction:
 class BlockTimestamp:
     slot: int
     timestamp: int
+
+
+@dataclasses.dataclass(frozen=True)
+class AccountSnapshot:
+    slot: int
+    accounts: List[Optional[Any]]
@@ -1,9 +1,14 @@
-import math
-from decimal import Decimal
 from ..types.types import TokenAmounts
 from ..invariant import invariant
 
 
+def _div_round_up_if(n: int, d: int, round_up: bool) -> int:
+    q, r = divmod(n, d)
+    if round_up and r != 0:
+        return q + 1
+    return q
+
+
 class LiquidityMath:
     # https://orca-so.github.io/whirlpools/classes/PoolUtil.html#getTokenAmountsFromLiquidity
     # https://github.com/orca-so/whirlpools/blob/7b9ec35/sdk/src/utils/public/pool-utils.ts#L84
@@ -17,19 +22,11 @@ class LiquidityMath:
     ) -> TokenAmounts:
         invariant(sqrt_price_x64_lower < sqrt_price_x64_upper, "sqrt_price_x64_lower < sqrt_price_x64_upper")
 
-        liq = Decimal(liquidity)
-        lower = Decimal(sqrt_price_x64_lower)
-        upper = Decimal(sqrt_price_x64_upper)
-        current = min(max(Decimal(sqrt_price_x64_current), lower), upper)  # bounded
-
-        shift_64 = Decimal(2)**64
-        token_a = liq * shift_64 * (upper - current) / (current * upper)
-        token_b = liq * (current - lower) / shift_64
-
-        if round_up:
-            return TokenAmounts(math.ceil(token_a), math.ceil(token_b))
-        else:
-            return TokenAmounts(math.floor(token_a), math.floor(token_b))
+        current = min(max(sqrt_price_x64_current, sqrt_price_x64_lower), sqrt_price_x64_upper)  # bounded
+        return TokenAmounts(
+            LiquidityMath.get_amount_delta_a(liquidity, current, sqrt_price_x64_upper, round_up),
+            LiquidityMath.get_amount_delta_b(liquidity, sqrt_price_x64_lower, current, round_up),
+        )
 
     @staticmethod
     def get_token_a_from_liquidity(
@@ -38,18 +35,9 @@ class LiquidityMath:
         sqrt_price_x64_1: int,
         round_up: bool
     ) -> int:
-        small_sqrt_price_x64 = min(sqrt_price_x64_0, sqrt_price_x64_1)
-        large_sqrt_price_x64 = max(sqrt_price_x64_0, sqrt_price_x64_1)
-        if small_sqrt_price_x64 == large_sqrt_price_x64:
-            return 0
-
-        return LiquidityMath.get_token_amounts_from_liquidity(
-            liquidity,
-            small_sqrt_price_x64,
-            small_sqrt_price_x64,
-            large_sqrt_price_x64,
-            round_up
-        ).token_a
+        if sqrt_price_x64_0 < sqrt_price_x64_1:
+            return LiquidityMath.get_amount_delta_a(liquidity, sqrt_price_x64_0, sqrt_price_x64_1, round_up)
+        return LiquidityMath.get_amount_delta_a(liquidity, sqrt_price_x64_1, sqrt_price_x64_0, round_up)
 
     @staticmethod
     def get_token_b_from_liquidity(
@@ -58,18 +46,29 @@ class LiquidityMath:
             sqrt_price_x64_1: int,
             round_up: bool
     ) -> int:
-        small_sqrt_price_x64 = min(sqrt_price_x64_0, sqrt_price_x64_1)
-        large_sqrt_price_x64 = max(sqrt_price_x64_0, sqrt_price_x64_1)
+        if sqrt_price_x64_0 < sqrt_price_x64_1:
+            return LiquidityMath.get_amount_delta_b(liquidity, sqrt_price_x64_0, sqrt_price_x64_1, round_up)
+        return LiquidityMath.get_amount_delta_b(liquidity, sqrt_price_x64_1, sqrt_price_x64_0, round_up)
+
+    # integer only (no Decimal), same rounding as the program
+    # https://github.com/orca-so/whirlpools/blob/7b9ec35/programs/whirlpool/src/math/token_math.rs#L31
+    @staticmethod
+    def get_amount_delta_a(liquidity: int, small_sqrt_price_x64: int, large_sqrt_price_x64: int, round_up: bool) -> int:
+        # a = L * x64 * (large_sqrt_price_x64 - small_sqrt_price_x64) / (small_sqrt_price_x64 * large_sqrt_price_x64)
         if small_sqrt_price_x64 == large_sqrt_price_x64:
             return 0
+        numerator = (liquidity * (large_sqrt_price_x64 - small_sqrt_price_x64)) << 64
+        denominator = small_sqrt_price_x64 * large_sqrt_price_x64
+        return _div_round_up_if(numerator, denominator, round_up)
 
-        return LiquidityMath.get_token_amounts_from_liquidity(
-            liquidity,
-            large_sqrt_price_x64,
-            small_sqrt_price_x64,
-            large_sqrt_price_x64,
-            round_up
-        ).token_b
+    # https://github.com/orca-so/whirlpools/blob/7b9ec35/programs/whirlpool/src/math/token_math.rs#L83
+    @staticmethod
+    def get_amount_delta_b(liquidity: int, small_sqrt_price_x64: int, large_sqrt_price_x64: int, round_up: bool) -> int:
+        # b = L * (large_sqrt_price_x64 - small_sqrt_price_x64) / x64
+        p = liquidity * (large_sqrt_price_x64 - small_sqrt_price_x64)
+        if round_up:
+            return -((-p) >> 64)
+        return p >> 64
 
     # https://github.com/orca-so/whirlpools/blob/7b9ec35/sdk/src/utils/public/pool-utils.ts#L237
     @staticmethod
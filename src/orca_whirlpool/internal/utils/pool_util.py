@@ -55,7 +55,9 @@ class PoolUtil:
         current_lower_tick_index = MIN_TICK_INDEX
         current_liquidity = 0
         for ta in sorted_tick_arrays:
-            for i, tick in enumerate(ta.ticks):
+            # uninitialized ticks have no liquidity_net
+            for i in ta.initialized_offsets:
+                tick = ta.ticks[i]
                 if tick.liquidity_net == 0:
                     continue
 
@@ -1,5 +1,9 @@
 import math
+import functools
+from collections import OrderedDict
 from decimal import Decimal
+from typing import List, Optional
+from ..constants import MIN_SQRT_PRICE, MAX_SQRT_PRICE
 from .q64_fixed_point_math import Q64FixedPointMath
 from .tick_util import TickUtil
 
@@ -82,7 +86,85 @@ def tick_index_to_sqrt_price_negative(tick_index: int) -> int:
     return ratio
 
 
+def tick_index_to_sqrt_price_x64_uncached(tick_index: int) -> int:
+    if tick_index > 0:
+        return tick_index_to_sqrt_price_positive(tick_index)
+    else:
+        return tick_index_to_sqrt_price_negative(tick_index)
+
+
+# optional LRU cache (disabled by default), see PriceMath.set_tick_index_to_sqrt_price_cache_size
+_tick_index_to_sqrt_price_x64 = tick_index_to_sqrt_price_x64_uncached
+
+
+def sqrt_price_x64_to_tick_index_by_log(sqrt_price_x64: int) -> int:
+    # rough calculation
+    shift_64 = 2**64
+    sqrt_price = sqrt_price_x64 / shift_64
+    price = sqrt_price**2
+    tick_index = math.floor(math.log(price) / math.log(1.0001))
+
+    # adjust to exact result
+    while PriceMath.tick_index_to_sqrt_price_x64(tick_index)   >  sqrt_price_x64: tick_index = tick_index - 1
+    while PriceMath.tick_index_to_sqrt_price_x64(tick_index+1) <= sqrt_price_x64: tick_index = tick_index + 1
+    return tick_index
+
+
+# https://github.com/orca-so/whirlpools/blob/2df89bb/programs/whirlpool/src/math/tick_math.rs
+# integer only, valid for MIN_SQRT_PRICE <= sqrt_price_x64 <= MAX_SQRT_PRICE
+BIT_PRECISION = 14
+LOG_B_2_X32 = 59543866431248
+LOG_B_P_ERR_MARGIN_LOWER_X64 = 184467440737095516
+LOG_B_P_ERR_MARGIN_UPPER_X64 = 15793534762490258745
+
+
+def sqrt_price_x64_to_tick_index_by_log2(sqrt_price_x64: int) -> int:
+    msb = sqrt_price_x64.bit_length() - 1
+    log2p_integer_x32 = (msb - 64) << 32
+
+    # get fractional value (r/2^msb)
+    # we begin the iteration from bit 63 (0.5 in Q64.64)
+    bit = 0x8000_0000_0000_0000
+    log2p_fraction_x64 = 0
+    if msb >= 64:
+        r = sqrt_price_x64 >> (msb - 63)
+    else:
+        r = sqrt_price_x64 << (63 - msb)
+
+    # log2(x) = 1/2 * log2(x^2), so square r and check if it is greater than 2
+    for _ in range(BIT_PRECISION):
+        r *= r
+        is_r_more_than_two = r >> 127
+        r >>= 63 + is_r_more_than_two
+        if is_r_more_than_two:
+            log2p_fraction_x64 += bit
+        bit >>= 1
+
+    log2p_fraction_x32 = log2p_fraction_x64 >> 32
+    log2p_x32 = log2p_integer_x32 + log2p_fraction_x32
+
+    # transform from base 2 to base b
+    logbp_x64 = log2p_x32 * LOG_B_2_X32
+
+    tick_low = (logbp_x64 - LOG_B_P_ERR_MARGIN_LOWER_X64) >> 64
+    tick_high = (logbp_x64 + LOG_B_P_ERR_MARGIN_UPPER_X64) >> 64
+    if tick_low == tick_high:
+        return tick_low
+
+    # the error margin is at most one tick, so one verification is enough
+    if PriceMath.tick_index_to_sqrt_price_x64(tick_high) <= sqrt_price_x64:
+        return tick_high
+    return tick_low
+
+
+# tick_spacing=64: about 1MB per table
+MAX_SQRT_PRICE_TABLES = 4
+
+
 class PriceMath:
+    # least recently used first
+    _sqrt_price_tables: "OrderedDict[int, SqrtPriceTable]" = OrderedDict()
+
     # https://orca-so.github.io/whirlpools/classes/PriceMath.html#sqrtPriceX64ToPrice
     # https://github.com/orca-so/whirlpools/blob/main/sdk/src/utils/public/price-math.ts#L22
     @staticmethod
@@ -95,25 +177,67 @@ class PriceMath:
     # https://github.com/orca-so/whirlpools/blob/2df89bb/sdk/src/utils/public/price-math.ts#L49
     @staticmethod
     def sqrt_price_x64_to_tick_index(sqrt_price_x64: int) -> int:
-        # rough calculation
-        shift_64 = 2**64
-        sqrt_price = sqrt_price_x64 / shift_64
-        price = sqrt_price**2
-        tick_index = math.floor(math.log(price) / math.log(1.0001))
+        if not MIN_SQRT_PRICE <= sqrt_price_x64 <= MAX_SQRT_PRICE:
+            return sqrt_price_x64_to_tick_index_by_log(sqrt_price_x64)
+        return sqrt_price_x64_to_tick_index_by_log2(sqrt_price_x64)
 
-        # adjust to exact result
-        while PriceMath.tick_index_to_sqrt_price_x64(tick_index)   >  sqrt_price_x64: tick_index = tick_index - 1
-        while PriceMath.tick_index_to_sqrt_price_x64(tick_index+1) <= sqrt_price_x64: tick_index = tick_index + 1
-        return tick_index
+    @staticmethod
+    def sqrt_prices_x64_to_tick_indexes(sqrt_prices_x64: List[int]) -> List[int]:
+        # same sqrt_price is converted only once
+        tick_indexes = {}
+        for sqrt_price_x64 in sqrt_prices_x64:
+            if sqrt_price_x64 not in tick_indexes:
+                tick_indexes[sqrt_price_x64] = PriceMath.sqrt_price_x64_to_tick_index(sqrt_price_x64)
+        return [tick_indexes[sqrt_price_x64] for sqrt_price_x64 in sqrt_prices_x64]
 
     # https://orca-so.github.io/whirlpools/classes/PriceMath.html#tickIndexToSqrtPriceX64
     # https://github.com/orca-so/whirlpools/blob/2df89bb/sdk/src/utils/public/price-math.ts#L36
     @staticmethod
     def tick_index_to_sqrt_price_x64(tick_index: int) -> int:
-        if tick_index > 0:
-            return tick_index_to_sqrt_price_positive(tick_index)
+        return _tick_index_to_sqrt_price_x64(tick_index)
+
+    @staticmethod
+    def set_tick_index_to_sqrt_price_cache_size(maxsize: Optional[int]):
+        # boundaries of the current and neighboring ticks are hit repeatedly by quotes
+        # None or 0 disables the cache (default)
+        global _tick_index_to_sqrt_price_x64
+        if not maxsize:
+            _tick_index_to_sqrt_price_x64 = tick_index_to_sqrt_price_x64_uncached
         else:
-            return tick_index_to_sqrt_price_negative(tick_index)
+            _tick_index_to_sqrt_price_x64 = functools.lru_cache(maxsize=maxsize)(tick_index_to_sqrt_price_x64_uncached)
+
+    @staticmethod
+    def build_sqrt_price_table(tick_spacing: int) -> "SqrtPriceTable":
+        # building is slow for small tick_spacing (tick_spacing=1: a few seconds), so it is never done implicitly
+        # the least recently used table is dropped if over MAX_SQRT_PRICE_TABLES
+        tables = PriceMath._sqrt_price_tables
+        table = PriceMath.get_sqrt_price_table(tick_spacing)
+        if table is None:
+            table = SqrtPriceTable(tick_spacing)
+            tables[tick_spacing] = table
+            while len(tables) > MAX_SQRT_PRICE_TABLES:
+                tables.popitem(last=False)
+        return table
+
+    @staticmethod
+    def get_sqrt_price_table(tick_spacing: int) -> Optional["SqrtPriceTable"]:
+        # None if not built
+        tables = PriceMath._sqrt_price_tables
+        table = tables.get(tick_spacing)
+        if table is not None:
+            tables.move_to_end(tick_spacing)
+        return table
+
+    @staticmethod
+    def list_sqrt_price_table_tick_spacings() -> List[int]:
+        # least recently used first
+        return list(PriceMath._sqrt_price_tables.keys())
+
+    @staticmethod
+    def reset_sqrt_price_caches():
+        # drop all sqrt price tables and disable the LRU cache
+        PriceMath._sqrt_price_tables.clear()
+        PriceMath.set_tick_index_to_sqrt_price_cache_size(None)
 
     # https://orca-so.github.io/whirlpools/classes/PriceMath.html#tickIndexToPrice
     # https://github.com/orca-so/whirlpools/blob/7b9ec35/sdk/src/utils/public/price-math.ts#L101
@@ -148,3 +272,28 @@ class PriceMath:
             PriceMath.price_to_tick_index(price, decimals_a, decimals_b),
             tick_spacing
         )
+
+
+class SqrtPriceTable:
+    # precomputed sqrt prices of all initializable ticks for a tick_spacing
+    # tick_spacing=64: 13,863 entries, tick_spacing=1: 887,273 entries (slow to build)
+    def __init__(self, tick_spacing: int):
+        lower, upper = TickUtil.get_full_range_tick_index(tick_spacing)
+        self.tick_spacing = tick_spacing
+        self.min_tick_index = lower
+        self.max_tick_index = upper
+        # bypass LRU cache (table covers all ticks)
+        self._sqrt_prices = [
+            tick_index_to_sqrt_price_x64_uncached(tick_index)
+            for tick_index in range(lower, upper + 1, tick_spacing)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._sqrt_prices)
+
+    def get(self, tick_index: int) -> int:
+        # non-initializable or out of range tick is calculated
+        i, remainder = divmod(tick_index - self.min_tick_index, self.tick_spacing)
+        if remainder != 0 or not 0 <= i < len(self._sqrt_prices):
+            return PriceMath.tick_index_to_sqrt_price_x64(tick_index)
+        return self._sqrt_prices[i]
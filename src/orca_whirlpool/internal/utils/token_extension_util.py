@@ -0,0 +1,172 @@
+import dataclasses
+import struct
+from enum import IntEnum
+from typing import Dict, Optional
+from solders.pubkey import Pubkey
+
+
+# https://github.com/solana-labs/solana-program-library/blob/master/token/program-2022/src/extension/mod.rs
+class ExtensionType(IntEnum):
+    Uninitialized = 0
+    TransferFeeConfig = 1
+    TransferFeeAmount = 2
+    MintCloseAuthority = 3
+    ConfidentialTransferMint = 4
+    ConfidentialTransferAccount = 5
+    DefaultAccountState = 6
+    ImmutableOwner = 7
+    MemoTransfer = 8
+    NonTransferable = 9
+    InterestBearingConfig = 10
+    CpiGuard = 11
+    PermanentDelegate = 12
+    NonTransferableAccount = 13
+    TransferHook = 14
+    TransferHookAccount = 15
+    ConfidentialTransferFeeConfig = 16
+    ConfidentialTransferFeeAmount = 17
+    MetadataPointer = 18
+    TokenMetadata = 19
+    GroupPointer = 20
+    TokenGroup = 21
+    GroupMemberPointer = 22
+    TokenGroupMember = 23
+
+
+@dataclasses.dataclass(frozen=True)
+class TransferFee:
+    epoch: int
+    maximum_fee: int
+    transfer_fee_basis_points: int
+
+
+@dataclasses.dataclass(frozen=True)
+class TransferFeeConfig:
+    transfer_fee_config_authority: Optional[Pubkey]
+    withdraw_withheld_authority: Optional[Pubkey]
+    withheld_amount: int
+    older_transfer_fee: TransferFee
+    newer_transfer_fee: TransferFee
+
+    # https://github.com/solana-labs/solana-program-library/blob/master/token/js/src/extensions/transferFee/state.ts
+    def get_epoch_fee(self, epoch: int) -> TransferFee:
+        if epoch >= self.newer_transfer_fee.epoch:
+            return self.newer_transfer_fee
+        return self.older_transfer_fee
+
+
+@dataclasses.dataclass(frozen=True)
+class TransferHook:
+    authority: Optional[Pubkey]
+    program_id: Optional[Pubkey]
+
+
+@dataclasses.dataclass(frozen=True)
+class TokenExtensions:
+    # raw value of each extension (including extensions not parsed below)
+    raw: Dict[ExtensionType, bytes] = dataclasses.field(default_factory=dict)
+    # mint extensions
+    transfer_fee_config: Optional[TransferFeeConfig] = None
+    mint_close_authority: Optional[Pubkey] = None
+    default_account_state: Optional[int] = None
+    non_transferable: bool = False
+    permanent_delegate: Optional[Pubkey] = None
+    transfer_hook: Optional[TransferHook] = None
+    # account extensions
+    transfer_fee_amount: Optional[int] = None
+    immutable_owner: bool = False
+    memo_transfer_required: Optional[bool] = None
+    cpi_guard_enabled: Optional[bool] = None
+
+    def has(self, extension_type: ExtensionType) -> bool:
+        return extension_type in self.raw
+
+
+# unknown extension type is kept as int
+_EXTENSION_TYPE_VALUES = frozenset(e.value for e in ExtensionType)
+
+_TLV_HEADER_STRUCT = struct.Struct("<HH")
+_TRANSFER_FEE_STRUCT = struct.Struct("<QQH")
+_TRANSFER_FEE_CONFIG_STRUCT = struct.Struct("<32s32sQ")
+_U64_STRUCT = struct.Struct("<Q")
+
+
+def _optional_pubkey(b: bytes) -> Optional[Pubkey]:
+    # OptionalNonZeroPubkey: all zero means None
+    if b == bytes(32):
+        return None
+    return Pubkey.from_bytes(b)
+
+
+def _parse_transfer_fee(b: bytes, offset: int) -> TransferFee:
+    epoch, maximum_fee, transfer_fee_basis_points = _TRANSFER_FEE_STRUCT.unpack_from(b, offset)
+    return TransferFee(epoch, maximum_fee, transfer_fee_basis_points)
+
+
+class TokenExtensionUtil:
+    @staticmethod
+    def parse(tlv_data: bytes) -> TokenExtensions:
+        if len(tlv_data) == 0:
+            return TokenExtensions()
+
+        raw = {}
+        offset = 0
+        while offset + _TLV_HEADER_STRUCT.size <= len(tlv_data):
+            extension_type, length = _TLV_HEADER_STRUCT.unpack_from(tlv_data, offset)
+            if extension_type == ExtensionType.Uninitialized:
+                break
+            value_offset = offset + _TLV_HEADER_STRUCT.size
+            if value_offset + length > len(tlv_data):
+                break
+            if extension_type in _EXTENSION_TYPE_VALUES:
+                extension_type = ExtensionType(extension_type)
+            raw[extension_type] = bytes(tlv_data[value_offset:(value_offset+length)])
+            offset = value_offset + length
+
+        fields = {}
+        value = raw.get(ExtensionType.TransferFeeConfig)
+        if value is not None and len(value) >= 108:
+            transfer_fee_config_authority, withdraw_withheld_authority, withheld_amount = _TRANSFER_FEE_CONFIG_STRUCT.unpack_from(value, 0)
+            fields["transfer_fee_config"] = TransferFeeConfig(
+                transfer_fee_config_authority=_optional_pubkey(transfer_fee_config_authority),
+                withdraw_withheld_authority=_optional_pubkey(withdraw_withheld_authority),
+                withheld_amount=withheld_amount,
+                older_transfer_fee=_parse_transfer_fee(value, 72),
+                newer_transfer_fee=_parse_transfer_fee(value, 90),
+            )
+        value = raw.get(ExtensionType.TransferFeeAmount)
+        if value is not None and len(value) >= 8:
+            fields["transfer_fee_amount"] = _U64_STRUCT.unpack_from(value, 0)[0]
+        value = raw.get(ExtensionType.MintCloseAuthority)
+        if value is not None and len(value) >= 32:
+            fields["mint_close_authority"] = _optional_pubkey(value[0:32])
+        value = raw.get(ExtensionType.DefaultAccountState)
+        if value is not None and len(value) >= 1:
+            fields["default_account_state"] = value[0]
+        value = raw.get(ExtensionType.PermanentDelegate)
+        if value is not None and len(value) >= 32:
+            fields["permanent_delegate"] = _optional_pubkey(value[0:32])
+        value = raw.get(ExtensionType.TransferHook)
+        if value is not None and len(value) >= 64:
+            fields["transfer_hook"] = TransferHook(_optional_pubkey(value[0:32]), _optional_pubkey(value[32:64]))
+        value = raw.get(ExtensionType.MemoTransfer)
+        if value is not None and len(value) >= 1:
+            fields["memo_transfer_required"] = value[0] != 0
+        value = raw.get(ExtensionType.CpiGuard)
+        if value is not None and len(value) >= 1:
+            fields["cpi_guard_enabled"] = value[0] != 0
+
+        return TokenExtensions(
+            raw=raw,
+            non_transferable=ExtensionType.NonTransferable in raw,
+            immutable_owner=ExtensionType.ImmutableOwner in raw,
+            **fields,
+        )
+
+    # https://github.com/solana-labs/solana-program-library/blob/master/token/js/src/extensions/transferFee/state.ts
+    @staticmethod
+    def calculate_fee(transfer_fee: TransferFee, pre_fee_amount: int) -> int:
+        if transfer_fee.transfer_fee_basis_points == 0 or pre_fee_amount == 0:
+            return 0
+        fee = (pre_fee_amount * transfer_fee.transfer_fee_basis_points + 9999) // 10000
+        return min(fee, transfer_fee.maximum_fee)
@@ -1,11 +1,11 @@
 import dataclasses
+import struct
 from typing import Optional
 from solana.rpc.async_api import AsyncClient
 from solders.pubkey import Pubkey
 from solders.keypair import Keypair
 from solders import system_program
 from spl.token.instructions import get_associated_token_address
-from spl.token._layouts import MINT_LAYOUT, ACCOUNT_LAYOUT
 from spl.token.constants import TOKEN_PROGRAM_ID, TOKEN_2022_PROGRAM_ID, WRAPPED_SOL_MINT, ACCOUNT_LEN
 from spl.token import instructions as token_program
 from ..transaction.types import Instruction
@@ -13,6 +13,34 @@ from ..transaction.transaction_builder import EMPTY_INSTRUCTION
 from ..types.types import PublicKeyWithInstruction
 from ..invariant import invariant
 
+# fixed-offset layouts equivalent to spl.token._layouts.ACCOUNT_LAYOUT and MINT_LAYOUT
+_ACCOUNT_STRUCT = struct.Struct(
+    "<"
+    "32s"  # mint
+    "32s"  # owner
+    "Q"    # amount
+    "I"    # delegate_option
+    "32s"  # delegate
+    "B"    # state
+    "I"    # is_native_option
+    "Q"    # is_native
+    "Q"    # delegated_amount
+    "I"    # close_authority_option
+    "32s"  # close_authority
+)
+_MINT_STRUCT = struct.Struct(
+    "<"
+    "I"    # mint_authority_option
+    "32s"  # mint_authority
+    "Q"    # supply
+    "B"    # decimals
+    "B"    # is_initialized
+    "I"    # freeze_authority_option
+    "32s"  # freeze_authority
+)
+_ACCOUNT_MINT_OFFSET = 0
+_ACCOUNT_AMOUNT_OFFSET = 64
+
 
 @dataclasses.dataclass(frozen=True)
 class RawMintInfo:
@@ -59,27 +87,37 @@ class TokenUtil:
         else:
             return None
 
-        decoded_data = ACCOUNT_LAYOUT.parse(data)
-
-        mint = Pubkey(decoded_data.mint)
-        owner = Pubkey(decoded_data.owner)
-        amount = decoded_data.amount
-
-        if decoded_data.delegate_option == 0:
+        (
+            mint,
+            owner,
+            amount,
+            delegate_option,
+            delegate,
+            state,
+            is_native_option,
+            _is_native,
+            delegated_amount,
+            close_authority_option,
+            close_authority,
+        ) = _ACCOUNT_STRUCT.unpack_from(data)
+
+        mint = Pubkey(mint)
+        owner = Pubkey(owner)
+
+        if delegate_option == 0:
             delegate = None
             delegated_amount = 0
         else:
-            delegate = Pubkey(decoded_data.delegate)
-            delegated_amount = decoded_data.delegated_amount
+            delegate = Pubkey(delegate)
 
-        is_initialized = decoded_data.state != 0
-        is_native = decoded_data.is_native_option == 1
-        is_frozen = decoded_data.state == 2
+        is_initialized = state != 0
+        is_native = is_native_option == 1
+        is_frozen = state == 2
 
-        if decoded_data.close_authority_option == 0:
+        if close_authority_option == 0:
             close_authority = None
         else:
-            close_authority = Pubkey(decoded_data.owner)
+            close_authority = Pubkey(close_authority)
 
         tlv_data = data[166:] if len(data) > 165+1 else b""
 
@@ -97,6 +135,19 @@ class TokenUtil:
             tlv_data=tlv_data,
         )
 
+    # prefilter: read amount / mint of token account without deserializing whole account
+    @staticmethod
+    def read_token_account_amount(data: bytes) -> Optional[int]:
+        if len(data) < ACCOUNT_LEN:
+            return None
+        return int.from_bytes(data[_ACCOUNT_AMOUNT_OFFSET:(_ACCOUNT_AMOUNT_OFFSET+8)], "little")
+
+    @staticmethod
+    def read_token_account_mint(data: bytes) -> Optional[Pubkey]:
+        if len(data) < ACCOUNT_LEN:
+            return None
+        return Pubkey.from_bytes(data[_ACCOUNT_MINT_OFFSET:(_ACCOUNT_MINT_OFFSET+32)])
+
     # https://github.com/michaelhly/solana-py/blob/32119e6924d72cd2d605a949b28f2a366941d641/src/spl/token/core.py#L343
     @staticmethod
     def deserialize_mint(data: bytes, program_id: Pubkey) -> Optional[RawMintInfo]:
@@ -115,21 +166,27 @@ class TokenUtil:
         else:
             return None
 
-        decoded_data = MINT_LAYOUT.parse(data)
-        decimals = decoded_data.decimals
-
-        if decoded_data.mint_authority_option == 0:
+        (
+            mint_authority_option,
+            mint_authority,
+            supply,
+            decimals,
+            is_initialized,
+            freeze_authority_option,
+            freeze_authority,
+        ) = _MINT_STRUCT.unpack_from(data)
+
+        if mint_authority_option == 0:
             mint_authority = None
         else:
-            mint_authority = Pubkey(decoded_data.mint_authority)
+            mint_authority = Pubkey(mint_authority)
 
-        supply = decoded_data.supply
-        is_initialized = decoded_data.is_initialized != 0
+        is_initialized = is_initialized != 0
 
-        if decoded_data.freeze_authority_option == 0:
+        if freeze_authority_option == 0:
             freeze_authority = None
         else:
-            freeze_authority = Pubkey(decoded_data.freeze_authority)
+            freeze_authority = Pubkey(freeze_authority)
 
         tlv_data = data[166:] if len(data) > 165+1 else b""
 
@@ -2,12 +2,22 @@ from .internal.types.types import (
     PDA,
     TokenAmounts,
     BlockTimestamp,
+    AccountSnapshot,
     PublicKeyWithInstruction,
 )
 from .internal.types.enums import (
     SpecifiedAmount,
     SwapDirection,
     TickArrayReduction,
+    TickArrayDecoding,
     PositionStatus,
+    AccountType,
 )
 from .internal.types.percentage import Percentage
+from .internal.utils.token_extension_util import (
+    ExtensionType,
+    TokenExtensions,
+    TransferFee,
+    TransferFeeConfig,
+    TransferHook,
+)
@@ -10,3 +10,4 @@ from .internal.utils.price_math import PriceMath
 from .internal.utils.q64_fixed_point_math import Q64FixedPointMath
 from .internal.utils.tick_array_util import TickArrayUtil
 from .internal.utils.position_bundle_util import PositionBundleUtil
+from .internal.utils.token_extension_util import TokenExtensionUtil
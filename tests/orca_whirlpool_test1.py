@@ -8,7 +8,7 @@ from solders.instruction import AccountMeta
 from orca_whirlpool.internal.constants import ORCA_WHIRLPOOL_PROGRAM_ID, ORCA_WHIRLPOOLS_CONFIG, ORCA_WHIRLPOOLS_CONFIG_EXTENSION, MIN_TICK_INDEX, MAX_TICK_INDEX, MIN_SQRT_PRICE, MAX_SQRT_PRICE, U64_MAX, TICK_ARRAY_SIZE, FEE_RATE_MUL_VALUE, PROTOCOL_FEE_RATE_MUL_VALUE, NUM_REWARDS, MAX_SWAP_TICK_ARRAYS, METAPLEX_METADATA_PROGRAM_ID, ORCA_WHIRLPOOL_NFT_UPDATE_AUTHORITY, DEFAULT_PUBKEY
 from orca_whirlpool.internal.utils.pool_util import PoolUtil
 from orca_whirlpool.internal.utils.position_util import PositionUtil
-from orca_whirlpool.internal.utils.price_math import PriceMath
+from orca_whirlpool.internal.utils.price_math import PriceMath, MAX_SQRT_PRICE_TABLES, tick_index_to_sqrt_price_x64_uncached
 from orca_whirlpool.internal.utils.swap_util import SwapUtil
 from orca_whirlpool.internal.utils.pda_util import PDAUtil
 from orca_whirlpool.internal.utils.tick_util import TickUtil
@@ -192,6 +192,57 @@ class PriceMathTestCase(unittest.TestCase):
         expected = 19967060128772183316
         self.assertEqual(expected, result)
 
+    def test_tick_index_to_sqrt_price_x64_06(self):
+        # cached
+        PriceMath.set_tick_index_to_sqrt_price_cache_size(16)
+        try:
+            expected = PriceMath.tick_index_to_sqrt_price_x64(-39424)
+            self.assertEqual(2569692997056777477, expected)
+            self.assertEqual(expected, PriceMath.tick_index_to_sqrt_price_x64(-39424))
+            for tick_index in range(-100, 100):
+                self.assertEqual(tick_index_to_sqrt_price_x64_uncached(tick_index), PriceMath.tick_index_to_sqrt_price_x64(tick_index))
+        finally:
+            # disabled
+            PriceMath.reset_sqrt_price_caches()
+        self.assertEqual(2569692997056777477, PriceMath.tick_index_to_sqrt_price_x64(-39424))
+
+    def test_get_sqrt_price_table_01(self):
+        PriceMath.reset_sqrt_price_caches()
+        # never built implicitly
+        self.assertIsNone(PriceMath.get_sqrt_price_table(64))
+        table = PriceMath.build_sqrt_price_table(64)
+        self.assertIs(table, PriceMath.get_sqrt_price_table(64))
+        self.assertIs(table, PriceMath.build_sqrt_price_table(64))
+        self.assertEqual((-443584, 443584), (table.min_tick_index, table.max_tick_index))
+        self.assertEqual(443584 * 2 // 64 + 1, len(table))
+        self.assertEqual(1 << 64, table.get(0))
+        self.assertEqual(2569692997056777477, table.get(-39424))
+        # non-initializable or out of range tick is calculated
+        for tick_index in [MIN_TICK_INDEX, -39423, 1584, MAX_TICK_INDEX]:
+            self.assertEqual(PriceMath.tick_index_to_sqrt_price_x64(tick_index), table.get(tick_index))
+        for tick_index in range(table.min_tick_index, table.max_tick_index + 1, 64 * 101):
+            self.assertEqual(PriceMath.tick_index_to_sqrt_price_x64(tick_index), table.get(tick_index))
+
+        PriceMath.reset_sqrt_price_caches()
+        self.assertIsNone(PriceMath.get_sqrt_price_table(64))
+        self.assertEqual([], PriceMath.list_sqrt_price_table_tick_spacings())
+
+    def test_get_sqrt_price_table_02(self):
+        PriceMath.reset_sqrt_price_caches()
+        try:
+            # the number of tables is bounded
+            for tick_spacing in [128, 256, 512, 1024]:
+                PriceMath.build_sqrt_price_table(tick_spacing)
+            self.assertEqual([128, 256, 512, 1024], PriceMath.list_sqrt_price_table_tick_spacings())
+            # least recently used is dropped
+            self.assertIsNotNone(PriceMath.get_sqrt_price_table(128))
+            PriceMath.build_sqrt_price_table(2048)
+            self.assertEqual(MAX_SQRT_PRICE_TABLES, len(PriceMath.list_sqrt_price_table_tick_spacings()))
+            self.assertEqual([512, 1024, 128, 2048], PriceMath.list_sqrt_price_table_tick_spacings())
+            self.assertIsNone(PriceMath.get_sqrt_price_table(256))
+        finally:
+            PriceMath.reset_sqrt_price_caches()
+
     def test_sqrt_price_x64_to_tick_index_01(self):
         result = PriceMath.sqrt_price_x64_to_tick_index(1 << 64)
         expected = 0
@@ -217,6 +268,21 @@ class PriceMathTestCase(unittest.TestCase):
         expected = 1584
         self.assertEqual(expected, result)
 
+    def test_sqrt_price_x64_to_tick_index_06(self):
+        # boundaries of every 997th tick (price is floored to the tick)
+        for tick_index in range(MIN_TICK_INDEX + 1, MAX_TICK_INDEX, 997):
+            sqrt_price_x64 = PriceMath.tick_index_to_sqrt_price_x64(tick_index)
+            self.assertEqual(tick_index, PriceMath.sqrt_price_x64_to_tick_index(sqrt_price_x64))
+            self.assertEqual(tick_index, PriceMath.sqrt_price_x64_to_tick_index(sqrt_price_x64 + 1))
+            self.assertEqual(tick_index - 1, PriceMath.sqrt_price_x64_to_tick_index(sqrt_price_x64 - 1))
+
+    def test_sqrt_prices_x64_to_tick_indexes_01(self):
+        sqrt_prices_x64 = [1 << 64, MIN_SQRT_PRICE, MAX_SQRT_PRICE, 2569692997056777477, 1 << 64, 19967060128772183316]
+        result = PriceMath.sqrt_prices_x64_to_tick_indexes(sqrt_prices_x64)
+        expected = [0, MIN_TICK_INDEX, MAX_TICK_INDEX, -39424, 0, 1584]
+        self.assertEqual(expected, result)
+        self.assertEqual([], PriceMath.sqrt_prices_x64_to_tick_indexes([]))
+
     def test_sqrt_price_x64_to_price_01(self):
         result = PriceMath.sqrt_price_x64_to_price(1 << 64, 9, 6)
         expected = 1000
@@ -676,6 +742,29 @@ class LiquidityMathTestCase(unittest.TestCase):
         )
         self.assertEqual(339881, result)
 
+    def test_get_amount_delta_01(self):
+        # exact rounding (no precision loss even if the numerator exceeds 28 digits)
+        liquidity = 2**64 - 1
+        small = PriceMath.tick_index_to_sqrt_price_x64(-443636)
+        large = PriceMath.tick_index_to_sqrt_price_x64(443636)
+        num_a = liquidity * (large - small) * 2**64
+        den_a = small * large
+        num_b = liquidity * (large - small)
+        den_b = 2**64
+        self.assertEqual(-(-num_a // den_a), LiquidityMath.get_amount_delta_a(liquidity, small, large, True))
+        self.assertEqual(num_a // den_a, LiquidityMath.get_amount_delta_a(liquidity, small, large, False))
+        self.assertEqual(-(-num_b // den_b), LiquidityMath.get_amount_delta_b(liquidity, small, large, True))
+        self.assertEqual(num_b // den_b, LiquidityMath.get_amount_delta_b(liquidity, small, large, False))
+
+    def test_get_amount_delta_02(self):
+        # divisible case is not rounded up
+        self.assertEqual(1, LiquidityMath.get_amount_delta_b(2**64, 2**64, 2**64 + 1, True))
+        self.assertEqual(1, LiquidityMath.get_amount_delta_b(2**64, 2**64, 2**64 + 1, False))
+        self.assertEqual(1, LiquidityMath.get_amount_delta_a(2, 2**64, 2**65, True))
+        self.assertEqual(1, LiquidityMath.get_amount_delta_a(2, 2**64, 2**65, False))
+        self.assertEqual(0, LiquidityMath.get_amount_delta_a(1, 2**64, 2**64, True))
+        self.assertEqual(0, LiquidityMath.get_amount_delta_b(1, 2**64, 2**64, True))
+
     def test_get_liquidity_from_token_a_01(self):
         # in case
         result = LiquidityMath.get_liquidity_from_token_a(
@@ -1,7 +1,10 @@
 import unittest
+import asyncio
+import dataclasses
 import json
 import pathlib
 import base64
+import random
 from typing import Optional, List
 from solders.keypair import Keypair
 from solders.account import Account
@@ -11,9 +14,31 @@ from solders.rpc.responses import GetAccountInfoResp, GetMultipleAccountsResp, R
 from solana.rpc.async_api import AsyncClient
 from solana.rpc import types
 from solana.rpc.core import Commitment
-
-from orca_whirlpool.internal.accounts.account_fetcher import AccountFetcher
+from spl.token._layouts import ACCOUNT_LAYOUT, MINT_LAYOUT
+
+from orca_whirlpool.internal.accounts.account_fetcher import AccountFetcher, ChunkSizer, BULK_FETCH_CHUNK_SIZE, BULK_FETCH_CHUNK_MAX_BYTES
+from orca_whirlpool.internal.accounts.account_parser import AccountParser, WHIRLPOOL_HOT_FIELDS_OFFSET, WHIRLPOOL_HOT_FIELDS_LENGTH
+from orca_whirlpool.internal.accounts.keyed_account_converter import KeyedAccountConverter
+from orca_whirlpool.internal.accounts.keyed_account_decoder import KeyedAccountDecoder
+from orca_whirlpool.internal.accounts.columnar_decoder import ColumnarDecoder, np
+from orca_whirlpool.internal.accounts.tick_array_decoder import TickArrayDecoder, TickList, LazyTickList, SparseTickList
+from orca_whirlpool.internal.utils.tick_array_util import TickArrayUtil
+from orca_whirlpool.internal.utils.pool_util import PoolUtil
+from orca_whirlpool.internal.anchor.accounts import TickArray as AnchorTickArray
+from orca_whirlpool.internal.anchor.types import Tick as AnchorTick
+from orca_whirlpool.internal.accounts.account_cache import AccountCache, AccountCachePolicy, AccountCacheTTL
+from orca_whirlpool.internal.types.enums import AccountType, SwapDirection, SpecifiedAmount, TickArrayDecoding
+from orca_whirlpool.internal.types.percentage import Percentage
+from orca_whirlpool.internal.errors import WhirlpoolError
+from orca_whirlpool.internal.quote.quote_builder import QuoteBuilder, SwapQuoteParams
+from orca_whirlpool.internal.utils.swap_util import SwapUtil
+from orca_whirlpool.internal.utils.price_math import PriceMath
+from orca_whirlpool.internal.constants import ORCA_WHIRLPOOL_PROGRAM_ID, MIN_SQRT_PRICE, MAX_SQRT_PRICE
 from orca_whirlpool.internal.utils.token_util import TokenUtil
+from orca_whirlpool.internal.quote.swap_simulator.tick_array_sequence import TickArraySequence
+from orca_whirlpool.internal.quote.swap_simulator.swap_simulator import compute_swap, compute_swap_fast
+from orca_whirlpool.internal.quote.swap_simulator.swap_math import compute_swap_step, COMPUTE_SWAP_STEP_FAST
+from orca_whirlpool.internal.utils.token_extension_util import TokenExtensionUtil, ExtensionType, TransferFee, TransferFeeConfig
 
 ACCOUNT_JSON_FILES_DIR = "accounts"
 ASYNC_CLIENT_STUB_BLOCK_SLOT = 160156384
@@ -52,6 +77,7 @@ class AsyncClientStub(AsyncClient):
         # slot/timestamp
         self.block_slot = block_slot
         self.block_timestamp = block_timestamp
+        self.context_slot = 0
 
         # init history list
         self.get_account_info_called = 0
@@ -68,7 +94,7 @@ class AsyncClientStub(AsyncClient):
     ) -> GetAccountInfoResp:
         self.get_account_info_called += 1
         self.get_account_info_history.append(pubkey)
-        return GetAccountInfoResp(self._cache.get(str(pubkey)), RpcResponseContext(0))
+        return GetAccountInfoResp(self._slice(self._cache.get(str(pubkey)), data_slice), RpcResponseContext(self.context_slot))
 
     async def get_multiple_accounts(
         self,
@@ -80,10 +106,17 @@ class AsyncClientStub(AsyncClient):
         self.get_multiple_accounts_called += 1
         self.get_multiple_accounts_history.extend(pubkeys)
         return GetMultipleAccountsResp(
-            [self._cache.get(str(p)) for p in pubkeys],
-            RpcResponseContext(0)
+            [self._slice(self._cache.get(str(p)), data_slice) for p in pubkeys],
+            RpcResponseContext(self.context_slot)
         )
 
+    @staticmethod
+    def _slice(account: Optional[Account], data_slice: Optional[types.DataSliceOpts]) -> Optional[Account]:
+        if account is None or data_slice is None:
+            return account
+        data = account.data[data_slice.offset:(data_slice.offset+data_slice.length)]
+        return Account(account.lamports, data, account.owner, account.executable, account.rent_epoch)
+
     async def get_latest_blockhash(self, commitment: Optional[Commitment] = None) -> GetLatestBlockhashResp:
         return GetLatestBlockhashResp(
             RpcBlockhash(Hash(bytes(Keypair().pubkey())), self.block_slot),
@@ -240,6 +273,456 @@ class AccountFetcherAndParserAndKeyedConverterTestCase(unittest.IsolatedAsyncioT
         self.assertEqual(0, result.ticks[87].reward_growths_outside[1])
         self.assertEqual(0, result.ticks[87].reward_growths_outside[2])
 
+    def test_tick_array_decoder_01(self):
+        # must be identical to borsh decoder
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        json_filepaths = sorted(dir.glob("*_ta_*.json"))
+        self.assertTrue(len(json_filepaths) > 0)
+        for json_filepath in json_filepaths:
+            _, account = load_account_json(str(json_filepath))
+            self.assertEqual(AnchorTickArray.decode(account.data), TickArrayDecoder.decode(account.data))
+
+    def test_tick_array_decoder_02(self):
+        _, account = load_account_json(str(pathlib.Path(ACCOUNT_JSON_FILES_DIR) / "samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json"))
+        data = account.data
+
+        # extreme values
+        modified = bytearray(data)
+        offset = 8 + 4 + 113 * 5
+        modified[offset] = 1
+        modified[(offset+1):(offset+17)] = (-(1 << 127)).to_bytes(16, "little", signed=True)
+        modified[(offset+17):(offset+33)] = ((1 << 128) - 1).to_bytes(16, "little")
+        self.assertEqual(AnchorTickArray.decode(bytes(modified)), TickArrayDecoder.decode(bytes(modified)))
+        self.assertEqual(-(1 << 127), TickArrayDecoder.decode(bytes(modified)).ticks[5].liquidity_net)
+
+        # invalid data
+        self.assertIsNone(AccountParser.parse_tick_array(data[:-1]))
+        self.assertIsNone(AccountParser.parse_tick_array(bytes(8) + data[8:]))
+
+    def test_tick_array_decoder_lazy_01(self):
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        for json_filepath in sorted(dir.glob("*_ta_*.json")):
+            pubkey, account = load_account_json(str(json_filepath))
+            eager = AnchorTickArray.decode(account.data)
+            lazy = KeyedAccountDecoder.decode_tick_array_lazy(pubkey, account.data)
+            self.assertIsInstance(lazy.ticks, LazyTickList)
+            self.assertEqual(eager.start_tick_index, lazy.start_tick_index)
+            self.assertEqual(eager.whirlpool, lazy.whirlpool)
+            self.assertEqual(88, len(lazy.ticks))
+            for i in range(88):
+                self.assertEqual(eager.ticks[i].initialized, lazy.ticks.is_initialized(i))
+            self.assertEqual(eager.ticks, list(lazy.ticks))
+            self.assertEqual(KeyedAccountDecoder.decode_tick_array(pubkey, account.data), lazy)
+
+    def test_tick_array_decoder_lazy_02(self):
+        pubkey, account = load_account_json(str(pathlib.Path(ACCOUNT_JSON_FILES_DIR) / "samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json"))
+        ticks = KeyedAccountDecoder.decode_tick_array_lazy(pubkey, account.data).ticks
+
+        # memoized
+        self.assertIs(ticks[3], ticks[3])
+        self.assertIs(ticks[87], ticks[-1])
+        self.assertEqual(2413635782646, ticks[3].liquidity_net)
+        self.assertEqual([ticks[3], ticks[4]], ticks[3:5])
+        with self.assertRaises(IndexError):
+            _ = ticks[88]
+        with self.assertRaises(IndexError):
+            ticks.is_initialized(88)
+
+        self.assertIsNone(KeyedAccountDecoder.decode_tick_array_lazy(pubkey, account.data[:-1]))
+
+    async def test_tick_array_decoding_lazy_01(self):
+        json_filenames = [
+            "samo_usdc_wp_whirlpool.9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe.json",
+            "samo_usdc_wp_ta_n101376.HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF.json",
+            "samo_usdc_wp_ta_n107008.EE9AbRXbCKRGMeN6qAxxMUTEEPd1tQo67oYBQKkUNrfJ.json",
+            "samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json",
+            "samo_usdc_wp_ta_n118272.4xM1zPj8ihLFUs2DvptGVZKkdACSZgNaa8zpBTApNk9G.json",
+            "samo_usdc_wp_ta_n123904.Gad6jpBXSxFmSqcPSPTE9jABp9ragNc2VsdUCNWLEAMT.json",
+        ]
+        whirlpool_pubkey = Pubkey.from_string("9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe")
+        eager_fetcher = AccountFetcher(AsyncClientStub(json_filenames))
+        lazy_fetcher = AccountFetcher(AsyncClientStub(json_filenames), tick_array_decoding=TickArrayDecoding.Lazy)
+
+        for direction in [SwapDirection.AtoB, SwapDirection.BtoA]:
+            quotes = []
+            for fetcher in [eager_fetcher, lazy_fetcher]:
+                whirlpool = await fetcher.get_whirlpool(whirlpool_pubkey)
+                tick_array_pubkeys = SwapUtil.get_tick_array_pubkeys(whirlpool.tick_current_index, whirlpool.tick_spacing, direction, ORCA_WHIRLPOOL_PROGRAM_ID, whirlpool_pubkey)
+                tick_arrays = await fetcher.list_tick_arrays(tick_array_pubkeys)
+                quotes.append(QuoteBuilder.swap(SwapQuoteParams(
+                    whirlpool=whirlpool,
+                    amount=10000000000,
+                    other_amount_threshold=0,
+                    sqrt_price_limit=SwapUtil.get_default_sqrt_price_limit(direction),
+                    direction=direction,
+                    specified_amount=SpecifiedAmount.SwapInput,
+                    tick_arrays=tick_arrays,
+                    slippage_tolerance=Percentage.from_fraction(1, 100),
+                )))
+            self.assertIsInstance(tick_arrays[0].ticks, LazyTickList)
+            self.assertEqual(quotes[0], quotes[1])
+
+    def test_tick_array_decoder_sparse_01(self):
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        for json_filepath in sorted(dir.glob("*_ta_*.json")):
+            pubkey, account = load_account_json(str(json_filepath))
+            eager = AnchorTickArray.decode(account.data)
+            sparse = KeyedAccountDecoder.decode_tick_array_sparse(pubkey, account.data)
+            self.assertIsInstance(sparse.ticks, SparseTickList)
+            self.assertEqual(KeyedAccountDecoder.decode_tick_array(pubkey, account.data), sparse)
+            self.assertEqual(eager.ticks, list(sparse.ticks))
+            self.assertEqual(
+                [i for i, tick in enumerate(eager.ticks) if tick.initialized],
+                sparse.ticks.get_initialized_offsets(),
+            )
+            for i in range(88):
+                self.assertEqual(eager.ticks[i].initialized, sparse.ticks.is_initialized(i))
+                # no allocation on access
+                self.assertIs(sparse.ticks[i], sparse.ticks[i])
+            zero_ticks = [tick for i, tick in enumerate(sparse.ticks) if eager.ticks[i] == AnchorTick(False, 0, 0, 0, 0, [0, 0, 0])]
+            self.assertTrue(all(tick is zero_ticks[0] for tick in zero_ticks))
+
+        self.assertIsNone(KeyedAccountDecoder.decode_tick_array_sparse(pubkey, account.data[:-1]))
+        # TickList is abstract
+        with self.assertRaises(TypeError):
+            TickList()
+
+    async def test_tick_array_decoding_sparse_01(self):
+        json_filenames = [
+            "samo_usdc_wp_whirlpool.9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe.json",
+            "samo_usdc_wp_ta_n101376.HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF.json",
+            "samo_usdc_wp_ta_n107008.EE9AbRXbCKRGMeN6qAxxMUTEEPd1tQo67oYBQKkUNrfJ.json",
+            "samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json",
+            "samo_usdc_wp_ta_n118272.4xM1zPj8ihLFUs2DvptGVZKkdACSZgNaa8zpBTApNk9G.json",
+            "samo_usdc_wp_ta_n123904.Gad6jpBXSxFmSqcPSPTE9jABp9ragNc2VsdUCNWLEAMT.json",
+        ]
+        whirlpool_pubkey = Pubkey.from_string("9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe")
+        eager_fetcher = AccountFetcher(AsyncClientStub(json_filenames))
+        sparse_fetcher = AccountFetcher(AsyncClientStub(json_filenames), tick_array_decoding=TickArrayDecoding.Sparse)
+
+        whirlpool = await eager_fetcher.get_whirlpool(whirlpool_pubkey)
+        for direction in [SwapDirection.AtoB, SwapDirection.BtoA]:
+            tick_array_pubkeys = SwapUtil.get_tick_array_pubkeys(whirlpool.tick_current_index, whirlpool.tick_spacing, direction, ORCA_WHIRLPOOL_PROGRAM_ID, whirlpool_pubkey)
+            eager_tick_arrays = await eager_fetcher.list_tick_arrays(tick_array_pubkeys)
+            sparse_tick_arrays = await sparse_fetcher.list_tick_arrays(tick_array_pubkeys)
+            self.assertIsInstance(sparse_tick_arrays[0].ticks, SparseTickList)
+
+            # swap simulator
+            quotes = [
+                QuoteBuilder.swap(SwapQuoteParams(
+                    whirlpool=whirlpool,
+                    amount=10000000000,
+                    other_amount_threshold=0,
+                    sqrt_price_limit=SwapUtil.get_default_sqrt_price_limit(direction),
+                    direction=direction,
+                    specified_amount=SpecifiedAmount.SwapInput,
+                    tick_arrays=tick_arrays,
+                    slippage_tolerance=Percentage.from_fraction(1, 100),
+                ))
+                for tick_arrays in [eager_tick_arrays, sparse_tick_arrays]
+            ]
+            self.assertEqual(quotes[0], quotes[1])
+
+            # liquidity distribution
+            self.assertEqual(
+                PoolUtil.get_liquidity_distribution(whirlpool, eager_tick_arrays),
+                PoolUtil.get_liquidity_distribution(whirlpool, sparse_tick_arrays),
+            )
+
+            # get_tick_from_array
+            for eager_ta, sparse_ta in zip(eager_tick_arrays, sparse_tick_arrays):
+                for i in range(88):
+                    tick_index = eager_ta.start_tick_index + i * whirlpool.tick_spacing
+                    self.assertEqual(
+                        TickArrayUtil.get_tick_from_array(eager_ta, tick_index, whirlpool.tick_spacing),
+                        TickArrayUtil.get_tick_from_array(sparse_ta, tick_index, whirlpool.tick_spacing),
+                    )
+
+    def test_tick_array_initialized_offsets_01(self):
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        for json_filepath in sorted(dir.glob("*_ta_*.json")):
+            pubkey, account = load_account_json(str(json_filepath))
+            eager = KeyedAccountDecoder.decode_tick_array(pubkey, account.data)
+            expected = tuple(i for i, tick in enumerate(eager.ticks) if tick.initialized)
+            for decode in [KeyedAccountDecoder.decode_tick_array, KeyedAccountDecoder.decode_tick_array_lazy, KeyedAccountDecoder.decode_tick_array_sparse]:
+                tick_array = decode(pubkey, account.data)
+                offsets = tick_array.initialized_offsets
+                self.assertEqual(expected, offsets)
+                # memoized
+                self.assertIs(offsets, tick_array.initialized_offsets)
+                # not a part of equality and fields
+                self.assertEqual(eager, tick_array)
+                self.assertNotIn("_initialized_offsets", [f.name for f in dataclasses.fields(tick_array)])
+                self.assertEqual(["pubkey", "start_tick_index", "ticks", "whirlpool"], list(dataclasses.asdict(eager).keys()))
+
+            # replace gives a fresh memo
+            eager.initialized_offsets
+            ticks = list(eager.ticks)
+            ticks[0] = dataclasses.replace(ticks[0], initialized=not ticks[0].initialized)
+            replaced = dataclasses.replace(eager, ticks=ticks)
+            self.assertEqual(0 not in expected, 0 in replaced.initialized_offsets)
+
+    def test_parse_any_01(self):
+        expected_types = {
+            "whirlpools_config.": (AccountType.WhirlpoolsConfig, AccountParser.parse_whirlpools_config),
+            "whirlpools_config_extension.": (AccountType.WhirlpoolsConfigExtension, AccountParser.parse_whirlpools_config_extension),
+            "whirlpools_config_feetier": (AccountType.FeeTier, AccountParser.parse_fee_tier),
+            "token_badge_": (AccountType.TokenBadge, AccountParser.parse_token_badge),
+            "_wp_whirlpool.": (AccountType.Whirlpool, AccountParser.parse_whirlpool),
+            "_wp_ta_": (AccountType.TickArray, AccountParser.parse_tick_array),
+            "_wp_position.": (AccountType.Position, AccountParser.parse_position),
+            "token_": (AccountType.TokenMint, None),
+            "_wp_vault_": (AccountType.TokenAccount, None),
+            "_wp_reward": (AccountType.TokenAccount, None),
+            "user_ata_": (AccountType.TokenAccount, None),
+        }
+
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        for json_filepath in sorted(dir.glob("*.json")):
+            _, account = load_account_json(str(json_filepath))
+            result = AccountParser.parse_any(account.data, account.owner)
+
+            matched = [v for k, v in expected_types.items() if k in json_filepath.name]
+            if len(matched) == 0:
+                # system account
+                self.assertIsNone(result, json_filepath.name)
+                continue
+
+            account_type, parser = matched[0]
+            self.assertEqual(account_type, result[0], json_filepath.name)
+            if account_type == AccountType.TokenMint:
+                self.assertEqual(AccountParser.parse_token_mint(account.data, account.owner), result[1])
+            elif account_type == AccountType.TokenAccount:
+                self.assertEqual(AccountParser.parse_token_account(account.data, account.owner), result[1])
+            else:
+                self.assertEqual(parser(account.data), result[1])
+
+    def test_parse_any_02(self):
+        _, account = load_account_json(str(pathlib.Path(ACCOUNT_JSON_FILES_DIR) / "sol_usdc_wp_whirlpool.HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ.json"))
+        # unknown discriminator
+        self.assertIsNone(AccountParser.parse_any(bytes(8) + account.data[8:], account.owner))
+        # too short
+        self.assertIsNone(AccountParser.parse_any(account.data[:-1], account.owner))
+        self.assertIsNone(AccountParser.parse_any(b"", account.owner))
+        # owned by other program
+        self.assertIsNone(AccountParser.parse_any(account.data, Keypair().pubkey()))
+        self.assertIsNone(AccountParser.parse_any(account.data, account.owner, Keypair().pubkey()))
+        other_program_id = Keypair().pubkey()
+        self.assertEqual(AccountType.Whirlpool, AccountParser.parse_any(account.data, other_program_id, other_program_id)[0])
+        # invalid token account length
+        self.assertIsNone(AccountParser.parse_any(bytes(100), Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")))
+        self.assertIsNone(AccountParser.parse_any(bytes(200), Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")))
+
+    def test_parse_whirlpool_hot_fields_01(self):
+        # cross-check with full decode
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        for json_filepath in sorted(dir.glob("*_wp_whirlpool.*.json")):
+            _, account = load_account_json(str(json_filepath))
+            whirlpool = AccountParser.parse_whirlpool(account.data)
+            data = account.data[WHIRLPOOL_HOT_FIELDS_OFFSET:WHIRLPOOL_HOT_FIELDS_OFFSET + WHIRLPOOL_HOT_FIELDS_LENGTH]
+            self.assertEqual(
+                (whirlpool.liquidity, whirlpool.sqrt_price, whirlpool.tick_current_index),
+                AccountParser.parse_whirlpool_hot_fields(data)
+            )
+        self.assertIsNone(AccountParser.parse_whirlpool_hot_fields(bytes(WHIRLPOOL_HOT_FIELDS_LENGTH - 1)))
+
+    def test_keyed_account_decoder_01(self):
+        # must be identical to parser + keyed converter
+        cases = [
+            ("*_wp_whirlpool.*.json", KeyedAccountDecoder.decode_whirlpool, AccountParser.parse_whirlpool, KeyedAccountConverter.to_keyed_whirlpool),
+            ("*_wp_position.*.json", KeyedAccountDecoder.decode_position, AccountParser.parse_position, KeyedAccountConverter.to_keyed_position),
+            ("*_wp_ta_*.json", KeyedAccountDecoder.decode_tick_array, AccountParser.parse_tick_array, KeyedAccountConverter.to_keyed_tick_array),
+            ("*_wp_ta_*.json", KeyedAccountDecoder.decode_tick_array_lazy, AccountParser.parse_tick_array, KeyedAccountConverter.to_keyed_tick_array),
+            ("*_wp_ta_*.json", KeyedAccountDecoder.decode_tick_array_sparse, AccountParser.parse_tick_array, KeyedAccountConverter.to_keyed_tick_array),
+        ]
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        for pattern, decoder, parser, converter in cases:
+            json_filepaths = sorted(dir.glob(pattern))
+            self.assertTrue(len(json_filepaths) > 0)
+            for json_filepath in json_filepaths:
+                pubkey, account = load_account_json(str(json_filepath))
+                self.assertEqual(converter(pubkey, parser(account.data)), decoder(pubkey, account.data))
+
+                # invalid data
+                self.assertIsNone(decoder(pubkey, account.data[:-1]))
+                self.assertIsNone(decoder(pubkey, bytes(8) + account.data[8:]))
+
+    async def test_keyed_account_slots_01(self):
+        client = AsyncClientStub([
+            "sol_usdc_wp_whirlpool.HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ.json",
+            "sol_usdc_wp_position.5j3szbi2vnydYoyALNgttPD9YhCNwshUGkhzmzaP4WF7.json",
+            "sol_usdc_wp_ta_n33792.2Eh8HEeu45tCWxY6ruLLRN6VcTSD7bfshGj7bZA87Kne.json",
+            "token_usdc.EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v.json",
+            "user_ata_usdc.FbQdXCQgGQYj3xcGeryVVFjKCTsAuu53vmCRtmjQEqM5.json",
+        ])
+        fetcher = AccountFetcher(client)
+        accounts = [
+            await fetcher.get_whirlpool(Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ")),
+            await fetcher.get_position(Pubkey.from_string("5j3szbi2vnydYoyALNgttPD9YhCNwshUGkhzmzaP4WF7")),
+            await fetcher.get_tick_array(Pubkey.from_string("2Eh8HEeu45tCWxY6ruLLRN6VcTSD7bfshGj7bZA87Kne")),
+            await fetcher.get_token_mint(Pubkey.from_string("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v")),
+            await fetcher.get_token_account(Pubkey.from_string("FbQdXCQgGQYj3xcGeryVVFjKCTsAuu53vmCRtmjQEqM5")),
+        ]
+        for account in accounts:
+            self.assertFalse(hasattr(account, "__dict__"))
+            self.assertEqual(account, dataclasses.replace(account))
+            with self.assertRaises(dataclasses.FrozenInstanceError):
+                account.pubkey = Keypair().pubkey()
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_columnar_decoder_whirlpools_01(self):
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        loaded = [load_account_json(str(p)) for p in sorted(dir.glob("*_wp_whirlpool.*.json"))]
+        data = [account.data for _, account in loaded] + [None, b"", bytes(653)]
+        records = ColumnarDecoder.decode_whirlpools(data)
+        self.assertEqual(len(data), len(records))
+        self.assertEqual([True] * len(loaded) + [False] * 3, ColumnarDecoder.is_valid(records).tolist())
+
+        liquidity = ColumnarDecoder.to_u128(records, "liquidity")
+        sqrt_price = ColumnarDecoder.to_u128(records, "sqrt_price")
+        fee_growth_global_b = ColumnarDecoder.to_u128(records, "fee_growth_global_b")
+        growth_global_x64 = ColumnarDecoder.to_u128(records["reward_infos"], "growth_global_x64")
+        for i, (pubkey, account) in enumerate(loaded):
+            expected = KeyedAccountDecoder.decode_whirlpool(pubkey, account.data)
+            self.assertEqual(expected.whirlpools_config, Pubkey.from_bytes(records["whirlpools_config"][i].tobytes()))
+            self.assertEqual(expected.tick_spacing, records["tick_spacing"][i])
+            self.assertEqual(expected.fee_rate, records["fee_rate"][i])
+            self.assertEqual(expected.liquidity, liquidity[i])
+            self.assertEqual(expected.sqrt_price, sqrt_price[i])
+            self.assertEqual(expected.tick_current_index, records["tick_current_index"][i])
+            self.assertEqual(expected.token_mint_b, Pubkey.from_bytes(records["token_mint_b"][i].tobytes()))
+            self.assertEqual(expected.fee_growth_global_b, fee_growth_global_b[i])
+            self.assertEqual(expected.reward_last_updated_timestamp, records["reward_last_updated_timestamp"][i])
+            for r in range(3):
+                self.assertEqual(expected.reward_infos[r].mint, Pubkey.from_bytes(records["reward_infos"][i][r]["mint"].tobytes()))
+                self.assertEqual(expected.reward_infos[r].growth_global_x64, growth_global_x64[i][r])
+
+        self.assertEqual(0, liquidity[-1])
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_columnar_decoder_positions_01(self):
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        loaded = [load_account_json(str(p)) for p in sorted(dir.glob("*_wp_position.*.json"))]
+        data = [account.data for _, account in loaded] + [loaded[0][1].data[:-1]]
+        records = ColumnarDecoder.decode_positions(data)
+        self.assertEqual([True] * len(loaded) + [False], ColumnarDecoder.is_valid(records).tolist())
+
+        liquidity = ColumnarDecoder.to_u128(records, "liquidity")
+        fee_growth_checkpoint_a = ColumnarDecoder.to_u128(records, "fee_growth_checkpoint_a")
+        growth_inside_checkpoint = ColumnarDecoder.to_u128(records["reward_infos"], "growth_inside_checkpoint")
+        for i, (pubkey, account) in enumerate(loaded):
+            expected = KeyedAccountDecoder.decode_position(pubkey, account.data)
+            self.assertEqual(expected.whirlpool, Pubkey.from_bytes(records["whirlpool"][i].tobytes()))
+            self.assertEqual(expected.position_mint, Pubkey.from_bytes(records["position_mint"][i].tobytes()))
+            self.assertEqual(expected.liquidity, liquidity[i])
+            self.assertEqual(expected.tick_lower_index, records["tick_lower_index"][i])
+            self.assertEqual(expected.tick_upper_index, records["tick_upper_index"][i])
+            self.assertEqual(expected.fee_growth_checkpoint_a, fee_growth_checkpoint_a[i])
+            self.assertEqual(expected.fee_owed_b, records["fee_owed_b"][i])
+            for r in range(3):
+                self.assertEqual(expected.reward_infos[r].growth_inside_checkpoint, growth_inside_checkpoint[i][r])
+                self.assertEqual(expected.reward_infos[r].amount_owed, records["reward_infos"][i][r]["amount_owed"])
+
+    async def test_tick_array_sequence_01(self):
+        client = AsyncClientStub([
+            "samo_usdc_wp_whirlpool.9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe.json",
+            "samo_usdc_wp_ta_n101376.HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF.json",
+            "samo_usdc_wp_ta_n107008.EE9AbRXbCKRGMeN6qAxxMUTEEPd1tQo67oYBQKkUNrfJ.json",
+            "samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json",
+            "samo_usdc_wp_ta_n118272.4xM1zPj8ihLFUs2DvptGVZKkdACSZgNaa8zpBTApNk9G.json",
+            "samo_usdc_wp_ta_n123904.Gad6jpBXSxFmSqcPSPTE9jABp9ragNc2VsdUCNWLEAMT.json",
+        ])
+        fetcher = AccountFetcher(client)
+        whirlpool_pubkey = Pubkey.from_string("9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe")
+        whirlpool = await fetcher.get_whirlpool(whirlpool_pubkey)
+
+        for direction in [SwapDirection.AtoB, SwapDirection.BtoA]:
+            tick_array_pubkeys = SwapUtil.get_tick_array_pubkeys(whirlpool.tick_current_index, whirlpool.tick_spacing, direction, ORCA_WHIRLPOOL_PROGRAM_ID, whirlpool_pubkey)
+            tick_arrays = await fetcher.list_tick_arrays(tick_array_pubkeys)
+            sequence = TickArraySequence(tick_arrays, whirlpool.tick_current_index, whirlpool.tick_spacing, direction, 3)
+            initialized_ticks = sequence.initialized_ticks
+
+            # compare with linear scan
+            lowest = min(t.tick_index for t in initialized_ticks)
+            highest = max(t.tick_index for t in initialized_ticks)
+            for current_tick_index in range(lowest - 10, highest + 10, 7):
+                if direction.is_price_up:
+                    expected = [t for t in initialized_ticks if t.tick_index > current_tick_index]
+                else:
+                    expected = [t for t in initialized_ticks if t.tick_index <= current_tick_index]
+                if len(expected) == 0:
+                    with self.assertRaises(WhirlpoolError):
+                        sequence.get_next_initialized_tick_index(current_tick_index)
+                    continue
+                next_tick_index = sequence.get_next_initialized_tick_index(current_tick_index)
+                self.assertEqual(expected[0].tick_index, next_tick_index)
+                self.assertIs(expected[0].data, sequence.get_tick(next_tick_index))
+
+    def test_compute_swap_fast_01(self):
+        # differential test with compute_swap over fixtures
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        for pool in ["samo_usdc", "sol_usdc"]:
+            pubkey, account = load_account_json(str(next(dir.glob(pool + "_wp_whirlpool.*.json"))))
+            whirlpool = KeyedAccountDecoder.decode_whirlpool(pubkey, account.data)
+            tick_arrays = {}
+            for json_filepath in dir.glob(pool + "_wp_ta_*.json"):
+                ta_pubkey, ta_account = load_account_json(str(json_filepath))
+                tick_arrays[ta_pubkey] = KeyedAccountDecoder.decode_tick_array(ta_pubkey, ta_account.data)
+            # used if use_sqrt_price_table is True
+            PriceMath.build_sqrt_price_table(whirlpool.tick_spacing)
+
+            for direction in [SwapDirection.AtoB, SwapDirection.BtoA]:
+                tick_array_pubkeys = SwapUtil.get_tick_array_pubkeys(whirlpool.tick_current_index, whirlpool.tick_spacing, direction, ORCA_WHIRLPOOL_PROGRAM_ID, pubkey)
+                sequence = TickArraySequence([tick_arrays.get(p) for p in tick_array_pubkeys], whirlpool.tick_current_index, whirlpool.tick_spacing, direction, 3)
+                sqrt_price_limits = [
+                    SwapUtil.get_default_sqrt_price_limit(direction),
+                    (whirlpool.sqrt_price * 99 // 100) if direction.is_price_down else (whirlpool.sqrt_price * 101 // 100),
+                    whirlpool.sqrt_price,
+                ]
+                for specified_amount in [SpecifiedAmount.SwapInput, SpecifiedAmount.SwapOutput]:
+                    for sqrt_price_limit in sqrt_price_limits:
+                        for amount in [1, 7, 10**3, 10**6, 123456789, 10**9, 10**12, 10**15, 10**18, 2**64 - 1]:
+                            args = (whirlpool, sequence, amount, sqrt_price_limit, specified_amount, direction)
+                            try:
+                                expected = compute_swap(*args)
+                            except WhirlpoolError as e:
+                                for use_sqrt_price_table in [False, True]:
+                                    with self.assertRaises(WhirlpoolError) as cm:
+                                        compute_swap_fast(*args, use_sqrt_price_table)
+                                    self.assertEqual(str(e), str(cm.exception))
+                                continue
+                            self.assertEqual(expected, compute_swap_fast(*args))
+                            self.assertEqual(expected, compute_swap_fast(*args, True))
+        PriceMath.reset_sqrt_price_caches()
+
+    def test_compute_swap_step_fast_01(self):
+        # differential test with compute_swap_step (including errors)
+        random.seed(25)
+        for _ in range(3000):
+            remaining_amount = random.choice([0, 1, random.randrange(2**64), random.randrange(2**128)])
+            fee_rate = random.choice([0, 100, 3000, 10000, 999999])
+            liquidity = random.choice([0, 1, random.randrange(2**64), random.randrange(2**128)])
+            sqrt_price = random.randrange(MIN_SQRT_PRICE, MAX_SQRT_PRICE + 1)
+            for specified_amount in [SpecifiedAmount.SwapInput, SpecifiedAmount.SwapOutput]:
+                for direction in [SwapDirection.AtoB, SwapDirection.BtoA]:
+                    if direction.is_price_down:
+                        target_sqrt_price = random.randrange(MIN_SQRT_PRICE, sqrt_price + 1)
+                    else:
+                        target_sqrt_price = random.randrange(sqrt_price, MAX_SQRT_PRICE + 1)
+                    args = (remaining_amount, fee_rate, liquidity, sqrt_price, target_sqrt_price)
+                    compute_swap_step_fast = COMPUTE_SWAP_STEP_FAST[(specified_amount, direction)]
+                    try:
+                        expected = compute_swap_step(*args, specified_amount, direction)
+                    except WhirlpoolError as e:
+                        with self.assertRaises(WhirlpoolError) as cm:
+                            compute_swap_step_fast(*args)
+                        self.assertEqual(str(e), str(cm.exception))
+                        continue
+                    self.assertEqual(
+                        (expected.amount_in, expected.amount_out, expected.next_sqrt_price, expected.fee_amount),
+                        compute_swap_step_fast(*args),
+                    )
+
     async def test_get_position_01(self):
         client = AsyncClientStub(["sol_usdc_wp_position.5j3szbi2vnydYoyALNgttPD9YhCNwshUGkhzmzaP4WF7.json"])
         fetcher = AccountFetcher(client)
@@ -302,6 +785,91 @@ class AccountFetcherAndParserAndKeyedConverterTestCase(unittest.IsolatedAsyncioT
         self.assertEqual(700, len(result.tlv_data))
         self.assertEqual(bytes([0x03, 0x00, 0x20, 0x00]), result.tlv_data[0:4])
 
+    async def test_token_extensions_01(self):
+        client = AsyncClientStub([
+            "token_2022_pyusd.2b1kV6DkPAnxd5ixfnxCpjxmKwqjjaYmCZfHsFu24GXo.json",
+            "user_ata_2022_pyusd.2A7Cc48jwWWoixM5CWquQKEqk9KNQvY2Xw3WJbBRc6Ei.json",
+            "token_usdc.EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v.json",
+        ])
+        fetcher = AccountFetcher(client)
+
+        # Token-2022 mint
+        mint = await fetcher.get_token_mint(Pubkey.from_string("2b1kV6DkPAnxd5ixfnxCpjxmKwqjjaYmCZfHsFu24GXo"))
+        extensions = mint.extensions
+        self.assertIs(extensions, mint.extensions)  # memoized
+        self.assertIs(extensions, (await fetcher.get_token_mint(mint.pubkey)).extensions)  # cached
+        # memo is not a dataclass field
+        self.assertNotIn("_extensions", [f.name for f in dataclasses.fields(mint)])
+        self.assertNotIn("_extensions", dataclasses.asdict(mint))
+        self.assertIsNot(extensions, dataclasses.replace(mint).extensions)
+        self.assertEqual(
+            [
+                ExtensionType.MintCloseAuthority,
+                ExtensionType.PermanentDelegate,
+                ExtensionType.TransferFeeConfig,
+                ExtensionType.ConfidentialTransferMint,
+                ExtensionType.ConfidentialTransferFeeConfig,
+                ExtensionType.TransferHook,
+                ExtensionType.MetadataPointer,
+                ExtensionType.TokenMetadata,
+            ],
+            list(extensions.raw.keys()),
+        )
+        authority = Pubkey.from_string("2apBGMsS6ti9RyF5TwQTDswXBWskiJP2LD4cUEDqYJjk")
+        self.assertEqual(authority, extensions.mint_close_authority)
+        self.assertEqual(authority, extensions.permanent_delegate)
+        self.assertEqual(authority, extensions.transfer_hook.authority)
+        self.assertIsNone(extensions.transfer_hook.program_id)
+        self.assertEqual(authority, extensions.transfer_fee_config.transfer_fee_config_authority)
+        self.assertEqual(0, extensions.transfer_fee_config.withheld_amount)
+        self.assertEqual(TransferFee(605, 0, 0), extensions.transfer_fee_config.get_epoch_fee(700))
+        self.assertTrue(extensions.has(ExtensionType.TransferFeeConfig))
+        self.assertFalse(extensions.non_transferable)
+
+        # Token-2022 account
+        account = await fetcher.get_token_account(Pubkey.from_string("2A7Cc48jwWWoixM5CWquQKEqk9KNQvY2Xw3WJbBRc6Ei"))
+        self.assertTrue(account.extensions.immutable_owner)
+        self.assertEqual(0, account.extensions.transfer_fee_amount)
+        self.assertTrue(account.extensions.has(ExtensionType.TransferHookAccount))
+
+        # Token program
+        mint = await fetcher.get_token_mint(Pubkey.from_string("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"))
+        self.assertEqual({}, mint.extensions.raw)
+        self.assertIsNone(mint.extensions.transfer_fee_config)
+
+        # extensions are not part of equality
+        self.assertEqual(mint, dataclasses.replace(mint))
+
+    def test_token_extensions_02(self):
+        older = TransferFee(epoch=100, maximum_fee=1000, transfer_fee_basis_points=100)
+        newer = TransferFee(epoch=200, maximum_fee=50, transfer_fee_basis_points=500)
+        config = TransferFeeConfig(None, None, 0, older, newer)
+        self.assertEqual(older, config.get_epoch_fee(199))
+        self.assertEqual(newer, config.get_epoch_fee(200))
+
+        self.assertEqual(0, TokenExtensionUtil.calculate_fee(older, 0))
+        self.assertEqual(1, TokenExtensionUtil.calculate_fee(older, 1))  # ceil
+        self.assertEqual(10, TokenExtensionUtil.calculate_fee(older, 1000))
+        self.assertEqual(1000, TokenExtensionUtil.calculate_fee(older, 10 ** 9))  # maximum_fee
+        self.assertEqual(0, TokenExtensionUtil.calculate_fee(TransferFee(0, 1000, 0), 10 ** 9))
+
+        # TLV: TransferFeeAmount + unknown + MemoTransfer, followed by padding
+        tlv_data = b"".join([
+            (2).to_bytes(2, "little") + (8).to_bytes(2, "little") + (12345).to_bytes(8, "little"),
+            (999).to_bytes(2, "little") + (1).to_bytes(2, "little") + b"\x01",
+            (8).to_bytes(2, "little") + (1).to_bytes(2, "little") + b"\x01",
+            bytes(8),
+        ])
+        extensions = TokenExtensionUtil.parse(tlv_data)
+        self.assertEqual(12345, extensions.transfer_fee_amount)
+        self.assertTrue(extensions.memo_transfer_required)
+        self.assertEqual(b"\x01", extensions.raw[999])
+        self.assertEqual(3, len(extensions.raw))
+
+        # truncated value is ignored
+        extensions = TokenExtensionUtil.parse(tlv_data[:10])
+        self.assertEqual({}, extensions.raw)
+
     async def test_get_token_account_01(self):
         # Token Program
         client = AsyncClientStub(["user_ata_orca.7B8yNHX62NLvRswD86ttbGcV5TYxUsDNxEg2ZRMZLPRt.json"])
@@ -824,6 +1392,564 @@ class AccountFetcherAndParserAndKeyedConverterTestCase(unittest.IsolatedAsyncioT
         self.assertEqual(2, client.get_multiple_accounts_called)
         self.assertEqual(10, len(client.get_multiple_accounts_history))
 
+    async def test_cache_policy_ttl_slots_01(self):
+        client = AsyncClientStub([
+            "sol_usdc_wp_whirlpool.HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ.json",
+            "whirlpools_config.2LecshUwdy9xi7meFgHtFJQNSKk4KdTrcpvaB56dP2NQ.json",
+        ])
+        client.context_slot = 100
+        fetcher = AccountFetcher(client, AccountCachePolicy(ttls={AccountType.Whirlpool: AccountCacheTTL(slots=2)}))
+
+        whirlpool = await fetcher.get_whirlpool(Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ"))
+        await fetcher.get_whirlpools_config(Pubkey.from_string("2LecshUwdy9xi7meFgHtFJQNSKk4KdTrcpvaB56dP2NQ"))
+        self.assertEqual(2, client.get_account_info_called)
+        self.assertEqual(100, fetcher.cache.get_entry(str(whirlpool.pubkey)).slot)
+
+        # the latest slot is updated by other responses
+        client.context_slot = 102
+        await fetcher.get_whirlpool(Pubkey.from_string("2AEWSvUds1wsufnsDPCXjFsJCMJH5SNNm7fSF4kxys9a"))
+        await fetcher.get_whirlpool(Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ"))
+        self.assertEqual(3, client.get_account_info_called)
+
+        client.context_slot = 103
+        await fetcher.get_whirlpool(Pubkey.from_string("2AEWSvUds1wsufnsDPCXjFsJCMJH5SNNm7fSF4kxys9a"))
+        await fetcher.get_whirlpool(Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ"))
+        self.assertEqual(5, client.get_account_info_called)
+        self.assertEqual(103, fetcher.cache.get_entry(str(whirlpool.pubkey)).slot)
+
+        # WhirlpoolsConfig never expires
+        await fetcher.get_whirlpools_config(Pubkey.from_string("2LecshUwdy9xi7meFgHtFJQNSKk4KdTrcpvaB56dP2NQ"))
+        self.assertEqual(5, client.get_account_info_called)
+
+    def test_cache_policy_ttl_seconds_01(self):
+        now = [0.0]
+        cache = AccountCache(AccountCachePolicy(ttls={AccountType.TickArray: AccountCacheTTL(seconds=5)}), lambda: now[0])
+        cache.put("ta", AccountType.TickArray, "tick_array", 10, 9988)
+        cache.put("mint", AccountType.TokenMint, "mint", 10, 82)
+
+        now[0] = 5.0
+        self.assertEqual("tick_array", cache.get("ta"))
+        now[0] = 5.1
+        self.assertIsNone(cache.get("ta"))
+        self.assertEqual("mint", cache.get("mint"))
+        self.assertEqual(1, len(cache))
+        self.assertEqual(82, cache.total_bytes)
+
+    def test_cache_policy_lru_01(self):
+        cache = AccountCache(AccountCachePolicy(max_entries=2))
+        cache.put("a", AccountType.Position, "a", 1, 216)
+        cache.put("b", AccountType.Position, "b", 1, 216)
+        self.assertEqual("a", cache.get("a"))  # b is the least recently used
+        cache.put("c", AccountType.Position, "c", 1, 216)
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual("a", cache.get("a"))
+        self.assertEqual("c", cache.get("c"))
+
+        cache = AccountCache(AccountCachePolicy(max_bytes=20000))
+        cache.put("a", AccountType.TickArray, "a", 1, 9988)
+        cache.put("b", AccountType.TickArray, "b", 1, 9988)
+        cache.put("c", AccountType.Position, "c", 1, 216)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual("b", cache.get("b"))
+        self.assertEqual("c", cache.get("c"))
+        self.assertEqual(9988 + 216, cache.total_bytes)
+
+    def test_cache_put_01(self):
+        cache = AccountCache()
+        cache.put("a", AccountType.Whirlpool, "newer", 101, 653)
+        # older slot is ignored
+        entry = cache.put("a", AccountType.Whirlpool, "older", 100, 653)
+        self.assertEqual("newer", entry.value)
+        self.assertEqual("newer", cache.get("a"))
+        self.assertEqual(101, cache.get_entry("a").slot)
+        self.assertEqual(101, cache.latest_slot)
+        self.assertEqual(653, cache.total_bytes)
+        # same or newer slot replaces
+        cache.put("a", AccountType.Whirlpool, "same", 101, 653)
+        self.assertEqual("same", cache.get("a"))
+        cache.put("a", AccountType.Whirlpool, "newest", 102, 653)
+        self.assertEqual("newest", cache.get("a"))
+        self.assertEqual(102, cache.get_entry("a").slot)
+        self.assertEqual(1, len(cache))
+        self.assertEqual(653, cache.total_bytes)
+
+    async def test_cache_policy_lru_02(self):
+        client = AsyncClientStub([
+            "samo_usdc_wp_ta_n95744.C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH.json",
+            "samo_usdc_wp_ta_n101376.HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF.json",
+            "samo_usdc_wp_ta_n107008.EE9AbRXbCKRGMeN6qAxxMUTEEPd1tQo67oYBQKkUNrfJ.json",
+        ])
+        fetcher = AccountFetcher(client, AccountCachePolicy(max_entries=2))
+        result = await fetcher.list_tick_arrays([
+            Pubkey.from_string("C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH"),
+            Pubkey.from_string("HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF"),
+            Pubkey.from_string("EE9AbRXbCKRGMeN6qAxxMUTEEPd1tQo67oYBQKkUNrfJ"),
+        ])
+        # all results are returned even if the cache cannot hold them
+        self.assertEqual(-95744, result[0].start_tick_index)
+        self.assertEqual(-101376, result[1].start_tick_index)
+        self.assertEqual(-107008, result[2].start_tick_index)
+        self.assertEqual(2, len(fetcher.cache))
+        self.assertEqual(2 * 9988, fetcher.cache.total_bytes)
+
+    async def test_inflight_coalescing_get_01(self):
+        client = AsyncClientStub(["sol_usdc_wp_whirlpool.HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ.json"])
+        fetcher = AccountFetcher(client)
+        pubkey = Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ")
+        getting = asyncio.gather(*[fetcher.get_whirlpool(pubkey) for _ in range(10)])
+        await asyncio.sleep(0)
+        # fetch task is referenced while running
+        self.assertEqual(1, len(fetcher._tasks))
+        results = await getting
+        self.assertEqual(0, len(fetcher._tasks))
+        self.assertEqual(1, client.get_account_info_called)
+        self.assertEqual(0, client.get_multiple_accounts_called)
+        for result in results:
+            self.assertIs(results[0], result)
+
+        # refresh also coalesces
+        results = await asyncio.gather(*[fetcher.get_whirlpool(pubkey, True) for _ in range(10)])
+        self.assertEqual(2, client.get_account_info_called)
+        self.assertEqual(pubkey, results[9].pubkey)
+
+    async def test_inflight_coalescing_list_01(self):
+        client = AsyncClientStub([
+            "samo_usdc_wp_ta_n95744.C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH.json",
+            "samo_usdc_wp_ta_n101376.HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF.json",
+            "samo_usdc_wp_ta_n107008.EE9AbRXbCKRGMeN6qAxxMUTEEPd1tQo67oYBQKkUNrfJ.json",
+            "samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json",
+        ])
+        fetcher = AccountFetcher(client)
+        ta0 = Pubkey.from_string("C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH")
+        ta1 = Pubkey.from_string("HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF")
+        ta2 = Pubkey.from_string("EE9AbRXbCKRGMeN6qAxxMUTEEPd1tQo67oYBQKkUNrfJ")
+        ta3 = Pubkey.from_string("CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH")
+        result1, result2, result3 = await asyncio.gather(
+            fetcher.list_tick_arrays([ta0, ta1, ta2]),
+            fetcher.get_tick_array(ta1),
+            fetcher.list_tick_arrays([ta1, ta2, ta3]),
+        )
+        self.assertEqual(0, client.get_account_info_called)
+        self.assertEqual(2, client.get_multiple_accounts_called)
+        self.assertEqual([ta0, ta1, ta2, ta3], client.get_multiple_accounts_history)
+        self.assertEqual([-95744, -101376, -107008], [ta.start_tick_index for ta in result1])
+        self.assertIs(result1[1], result2)
+        self.assertEqual([-101376, -107008, -112640], [ta.start_tick_index for ta in result3])
+
+    async def test_inflight_coalescing_error_01(self):
+        class FailingAsyncClientStub(AsyncClientStub):
+            fail = True
+
+            async def get_account_info(self, pubkey: Pubkey, *args, **kwargs) -> GetAccountInfoResp:
+                if self.fail:
+                    self.get_account_info_called += 1
+                    raise ConnectionError("rpc error")
+                return await super().get_account_info(pubkey, *args, **kwargs)
+
+        client = FailingAsyncClientStub(["sol_usdc_wp_whirlpool.HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ.json"])
+        fetcher = AccountFetcher(client)
+        pubkey = Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ")
+        results = await asyncio.gather(fetcher.get_whirlpool(pubkey), fetcher.get_whirlpool(pubkey), return_exceptions=True)
+        self.assertEqual(1, client.get_account_info_called)
+        self.assertIsInstance(results[0], ConnectionError)
+        self.assertIsInstance(results[1], ConnectionError)
+
+        client.fail = False
+        result = await fetcher.get_whirlpool(pubkey)
+        self.assertEqual(2, client.get_account_info_called)
+        self.assertEqual(pubkey, result.pubkey)
+
+    async def test_micro_batching_01(self):
+        client = AsyncClientStub([
+            "sol_usdc_wp_whirlpool.HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ.json",
+            "samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json",
+            "token_usdc.EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v.json",
+        ])
+        fetcher = AccountFetcher(client, batch_window=0.001)
+        whirlpool, tick_array, mint, missing = await asyncio.gather(
+            fetcher.get_whirlpool(Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ")),
+            fetcher.get_tick_array(Pubkey.from_string("CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH")),
+            fetcher.get_token_mint(Pubkey.from_string("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v")),
+            fetcher.get_position(Pubkey.from_string("2AEWSvUds1wsufnsDPCXjFsJCMJH5SNNm7fSF4kxys9a")),
+        )
+        self.assertEqual(0, client.get_account_info_called)
+        self.assertEqual(1, client.get_multiple_accounts_called)
+        self.assertEqual(4, len(client.get_multiple_accounts_history))
+
+        self.assertEqual(-32101, whirlpool.tick_current_index)
+        self.assertEqual(-112640, tick_array.start_tick_index)
+        self.assertEqual(6, mint.decimals)
+        self.assertIsNone(missing)
+
+        # cached
+        await fetcher.get_whirlpool(Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ"))
+        self.assertEqual(1, client.get_multiple_accounts_called)
+
+    async def test_micro_batching_02(self):
+        client = AsyncClientStub([
+            "samo_usdc_wp_ta_n95744.C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH.json",
+            "samo_usdc_wp_ta_n101376.HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF.json",
+            "samo_usdc_wp_ta_n107008.EE9AbRXbCKRGMeN6qAxxMUTEEPd1tQo67oYBQKkUNrfJ.json",
+        ])
+        fetcher = AccountFetcher(client, batch_window=10.0, batch_max_size=2)
+        results = await asyncio.wait_for(asyncio.gather(
+            fetcher.get_tick_array(Pubkey.from_string("C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH")),
+            fetcher.get_tick_array(Pubkey.from_string("HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF")),
+        ), 1.0)
+        self.assertEqual(1, client.get_multiple_accounts_called)
+        self.assertEqual(-95744, results[0].start_tick_index)
+        self.assertEqual(-101376, results[1].start_tick_index)
+
+    async def test_micro_batching_03(self):
+        client = AsyncClientStub([
+            "samo_usdc_wp_ta_n95744.C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH.json",
+        ])
+        fetcher = AccountFetcher(client, batch_window=0.001)
+        pubkeys = [Keypair().pubkey() for _ in range(60)]
+        pubkeys[0] = Pubkey.from_string("C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH")
+        results = await asyncio.gather(*[fetcher.get_tick_array(pubkey) for pubkey in pubkeys])
+        # batch of tick arrays is split by the byte budget (52 tick arrays per chunk)
+        self.assertEqual(2, client.get_multiple_accounts_called)
+        self.assertEqual(-95744, results[0].start_tick_index)
+        self.assertEqual(59, results.count(None))
+        self.assertEqual(0, len(fetcher._tasks))
+
+    async def test_bulk_fetch_concurrency_01(self):
+        class SlowAsyncClientStub(AsyncClientStub):
+            running = 0
+            max_running = 0
+
+            async def get_multiple_accounts(self, pubkeys: List[Pubkey], *args, **kwargs) -> GetMultipleAccountsResp:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+                await asyncio.sleep(0.01)
+                self.running -= 1
+                return await super().get_multiple_accounts(pubkeys, *args, **kwargs)
+
+        client = SlowAsyncClientStub([
+            "samo_usdc_wp_ta_n95744.C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH.json",
+            "samo_usdc_wp_ta_n101376.HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF.json",
+            "samo_usdc_wp_ta_n107008.EE9AbRXbCKRGMeN6qAxxMUTEEPd1tQo67oYBQKkUNrfJ.json",
+        ])
+        fetcher = AccountFetcher(client, bulk_fetch_concurrency=2)
+        pubkeys = [Keypair().pubkey() for _ in range(450)]
+        pubkeys[0] = Pubkey.from_string("C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH")
+        pubkeys[250] = Pubkey.from_string("HpuNjdx9vTLYTAsxH3N6HCkguEkG9mCEpkrRugqyCPwF")
+        pubkeys[449] = Pubkey.from_string("EE9AbRXbCKRGMeN6qAxxMUTEEPd1tQo67oYBQKkUNrfJ")
+        result = await fetcher.list_tick_arrays(pubkeys)
+        self.assertEqual(9, client.get_multiple_accounts_called)  # 52 tick arrays per chunk
+        self.assertEqual(2, client.max_running)
+        self.assertEqual(450, len(result))
+        self.assertEqual(-95744, result[0].start_tick_index)
+        self.assertEqual(-101376, result[250].start_tick_index)
+        self.assertEqual(-107008, result[449].start_tick_index)
+        self.assertEqual(3, len(list(filter(lambda ta: ta is not None, result))))
+
+        # concurrent calls share the limit
+        client.max_running = 0
+        await asyncio.gather(
+            fetcher.list_whirlpools([Keypair().pubkey() for _ in range(300)], True),
+            fetcher.list_positions([Keypair().pubkey() for _ in range(300)], True),
+            fetcher.fetch_many([(Keypair().pubkey(), AccountType.TokenMint) for _ in range(300)], True),
+            fetcher.fetch_snapshot([(Keypair().pubkey(), AccountType.Position) for _ in range(300)]),
+        )
+        self.assertEqual(2, client.max_running)
+
+    def test_chunk_sizer_01(self):
+        self.assertEqual(BULK_FETCH_CHUNK_SIZE, ChunkSizer(None).chunk_size)
+        self.assertEqual(BULK_FETCH_CHUNK_SIZE, ChunkSizer(216).chunk_size)
+        self.assertEqual(BULK_FETCH_CHUNK_MAX_BYTES // 9988, ChunkSizer(9988).chunk_size)
+
+        sizer = ChunkSizer(9988)
+        max_chunk_size = sizer.chunk_size
+        # slow response
+        sizer.on_success(max_chunk_size, 5.0, max_chunk_size * 9988)
+        self.assertEqual(max_chunk_size // 2, sizer.chunk_size)
+        # failure
+        sizer.on_failure()
+        self.assertEqual(max_chunk_size // 4, sizer.chunk_size)
+        # fast responses grow chunk size up to the maximum
+        for _ in range(20):
+            sizer.on_success(sizer.chunk_size, 0.01, sizer.chunk_size * 9988)
+        self.assertEqual(max_chunk_size, sizer.chunk_size)
+
+        # larger accounts than expected
+        sizer = ChunkSizer(82)
+        sizer.on_success(100, 0.01, 100 * 10000)
+        self.assertEqual(BULK_FETCH_CHUNK_MAX_BYTES // 10000, sizer.chunk_size)
+
+    async def test_bulk_fetch_chunk_size_01(self):
+        client = AsyncClientStub([])
+        fetcher = AccountFetcher(client)
+        await fetcher.list_positions([Keypair().pubkey() for _ in range(200)])
+        self.assertEqual(2, client.get_multiple_accounts_called)
+        await fetcher.list_tick_arrays([Keypair().pubkey() for _ in range(200)])
+        self.assertEqual(2 + 4, client.get_multiple_accounts_called)
+
+    async def test_bulk_fetch_retry_01(self):
+        class FlakyAsyncClientStub(AsyncClientStub):
+            failures = 2
+
+            async def get_multiple_accounts(self, pubkeys: List[Pubkey], *args, **kwargs) -> GetMultipleAccountsResp:
+                if self.failures > 0:
+                    self.failures -= 1
+                    self.get_multiple_accounts_called += 1
+                    raise ConnectionError("rpc error")
+                return await super().get_multiple_accounts(pubkeys, *args, **kwargs)
+
+        client = FlakyAsyncClientStub(["samo_usdc_wp_ta_n95744.C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH.json"])
+        fetcher = AccountFetcher(client, bulk_fetch_max_retries=2)
+        result = await fetcher.list_tick_arrays([Pubkey.from_string("C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH")])
+        self.assertEqual(3, client.get_multiple_accounts_called)
+        self.assertEqual(-95744, result[0].start_tick_index)
+
+        client = FlakyAsyncClientStub(["samo_usdc_wp_ta_n95744.C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH.json"])
+        fetcher = AccountFetcher(client, bulk_fetch_max_retries=1)
+        with self.assertRaises(ConnectionError):
+            await fetcher.list_tick_arrays([Pubkey.from_string("C9ahCpEXEysPgA3NGZVqZcVViBoXpoS68tbo2pC4FNHH")])
+        self.assertEqual(2, client.get_multiple_accounts_called)
+
+    async def test_fetch_many_01(self):
+        client = AsyncClientStub([
+            "samo_usdc_wp_whirlpool.9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe.json",
+            "samo_usdc_wp_vault_a.3xxgYc3jXPdjqpMdrRyKtcddh4ZdtqpaN33fwaWJ2Wbh.json",
+            "token_samo.7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU.json",
+            "token_usdc.EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v.json",
+            "samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json",
+            "samo_usdc_wp_position.B66pRzGcKMmxRJ16KMkJMJoQWWhmyk4na4DPcv6X5ZRD.json",
+        ])
+        fetcher = AccountFetcher(client)
+        whirlpool, vault_a, mint_a, mint_b, tick_array, position, missing = await fetcher.fetch_many([
+            (Pubkey.from_string("9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe"), AccountType.Whirlpool),
+            (Pubkey.from_string("3xxgYc3jXPdjqpMdrRyKtcddh4ZdtqpaN33fwaWJ2Wbh"), AccountType.TokenAccount),
+            (Pubkey.from_string("7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU"), AccountType.TokenMint),
+            (Pubkey.from_string("EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"), AccountType.TokenMint),
+            (Pubkey.from_string("CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH"), AccountType.TickArray),
+            (Pubkey.from_string("B66pRzGcKMmxRJ16KMkJMJoQWWhmyk4na4DPcv6X5ZRD"), AccountType.Position),
+            (Pubkey.from_string("2AEWSvUds1wsufnsDPCXjFsJCMJH5SNNm7fSF4kxys9a"), AccountType.TickArray),
+        ])
+        self.assertEqual(0, client.get_account_info_called)
+        self.assertEqual(1, client.get_multiple_accounts_called)
+        self.assertEqual(7, len(client.get_multiple_accounts_history))
+
+        self.assertEqual(Pubkey.from_string("9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe"), whirlpool.pubkey)
+        self.assertEqual(whirlpool.token_vault_a, vault_a.pubkey)
+        self.assertEqual(whirlpool.token_mint_a, vault_a.mint)
+        self.assertEqual(9, mint_a.decimals)
+        self.assertEqual(6, mint_b.decimals)
+        self.assertEqual(-112640, tick_array.start_tick_index)
+        self.assertEqual(whirlpool.pubkey, position.whirlpool)
+        self.assertIsNone(missing)
+
+        # populated cache is shared with get_* and list_*
+        await fetcher.get_whirlpool(Pubkey.from_string("9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe"))
+        await fetcher.list_token_mints([whirlpool.token_mint_a, whirlpool.token_mint_b])
+        self.assertEqual(0, client.get_account_info_called)
+        self.assertEqual(1, client.get_multiple_accounts_called)
+
+    async def test_negative_cache_01(self):
+        client = AsyncClientStub(["samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json"])
+        client.context_slot = 100
+        fetcher = AccountFetcher(client, AccountCachePolicy(negative_ttl=AccountCacheTTL(slots=10)))
+        existing = Pubkey.from_string("CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH")
+        missing = Pubkey.from_string("2AEWSvUds1wsufnsDPCXjFsJCMJH5SNNm7fSF4kxys9a")
+
+        self.assertIsNone(await fetcher.get_tick_array(missing))
+        self.assertIsNone(await fetcher.get_tick_array(missing))
+        self.assertEqual(1, client.get_account_info_called)
+
+        result = await fetcher.list_tick_arrays([existing, missing])
+        self.assertEqual(-112640, result[0].start_tick_index)
+        self.assertIsNone(result[1])
+        self.assertEqual(1, client.get_multiple_accounts_called)
+        self.assertEqual([existing], client.get_multiple_accounts_history)
+
+        # expired
+        client.context_slot = 111
+        await fetcher.get_whirlpool(Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ"))
+        self.assertIsNone(await fetcher.get_tick_array(missing))
+        self.assertEqual(3, client.get_account_info_called)
+
+        # refresh bypasses the negative cache
+        self.assertIsNone(await fetcher.get_tick_array(missing, True))
+        self.assertEqual(4, client.get_account_info_called)
+
+        # existing accounts never expire
+        await fetcher.get_tick_array(existing)
+        self.assertEqual(4, client.get_account_info_called)
+        self.assertEqual(1, client.get_multiple_accounts_called)
+
+    async def test_negative_cache_02(self):
+        client = AsyncClientStub(["samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json"])
+        client.context_slot = 100
+        fetcher = AccountFetcher(client)
+        pubkey = Pubkey.from_string("CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH")
+        self.assertEqual(-112640, (await fetcher.get_tick_array(pubkey)).start_tick_index)
+
+        # closed account is dropped from the cache even if negative caching is disabled
+        del client._cache[str(pubkey)]
+        client.context_slot = 101
+        self.assertIsNone(await fetcher.get_tick_array(pubkey, True))
+        self.assertIsNone(fetcher.get_slot(pubkey))
+        self.assertIsNone(await fetcher.get_tick_array(pubkey))
+        self.assertEqual(3, client.get_account_info_called)
+
+    async def test_fetch_snapshot_01(self):
+        client = AsyncClientStub([
+            "samo_usdc_wp_whirlpool.9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe.json",
+            "samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json",
+            "samo_usdc_wp_ta_n118272.4xM1zPj8ihLFUs2DvptGVZKkdACSZgNaa8zpBTApNk9G.json",
+            "samo_usdc_wp_ta_n123904.Gad6jpBXSxFmSqcPSPTE9jABp9ragNc2VsdUCNWLEAMT.json",
+        ])
+        client.context_slot = 200
+        fetcher = AccountFetcher(client)
+        whirlpool_pubkey = Pubkey.from_string("9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe")
+        whirlpool = await fetcher.get_whirlpool(whirlpool_pubkey)
+        direction = SwapDirection.AtoB
+        tick_array_pubkeys = SwapUtil.get_tick_array_pubkeys(whirlpool.tick_current_index, whirlpool.tick_spacing, direction, ORCA_WHIRLPOOL_PROGRAM_ID, whirlpool_pubkey)
+
+        client.context_slot = 201
+        snapshot = await fetcher.fetch_snapshot(
+            [(whirlpool_pubkey, AccountType.Whirlpool)] + [(pubkey, AccountType.TickArray) for pubkey in tick_array_pubkeys]
+        )
+        self.assertEqual(1, client.get_account_info_called)
+        self.assertEqual(1, client.get_multiple_accounts_called)
+        self.assertEqual(201, snapshot.slot)
+        self.assertEqual(4, len(snapshot.accounts))
+        self.assertEqual(whirlpool_pubkey, snapshot.accounts[0].pubkey)
+        self.assertEqual(tick_array_pubkeys, [ta.pubkey for ta in snapshot.accounts[1:]])
+
+        # the cache is updated with the snapshot slot
+        self.assertEqual(201, fetcher.get_slot(whirlpool_pubkey))
+        for pubkey in tick_array_pubkeys:
+            self.assertEqual(201, fetcher.get_slot(pubkey))
+        self.assertIsNone(fetcher.get_slot(Pubkey.from_string("2AEWSvUds1wsufnsDPCXjFsJCMJH5SNNm7fSF4kxys9a")))
+
+        quote = QuoteBuilder.swap(SwapQuoteParams(
+            whirlpool=snapshot.accounts[0],
+            amount=1000000000,
+            other_amount_threshold=0,
+            sqrt_price_limit=SwapUtil.get_default_sqrt_price_limit(direction),
+            direction=direction,
+            specified_amount=SpecifiedAmount.SwapInput,
+            tick_arrays=snapshot.accounts[1:],
+            slippage_tolerance=Percentage.from_fraction(1, 100),
+        ))
+        self.assertEqual(1000000000, quote.estimated_amount_in)
+
+    async def test_fetch_snapshot_02(self):
+        class SlotAdvancingAsyncClientStub(AsyncClientStub):
+            advance = 0
+
+            async def get_multiple_accounts(self, pubkeys: List[Pubkey], *args, **kwargs) -> GetMultipleAccountsResp:
+                self.context_slot += self.advance
+                return await super().get_multiple_accounts(pubkeys, *args, **kwargs)
+
+        client = SlotAdvancingAsyncClientStub(["samo_usdc_wp_ta_n112640.CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH.json"])
+        client.context_slot = 300
+        fetcher = AccountFetcher(client)
+        items = [(Keypair().pubkey(), AccountType.TickArray) for _ in range(150)]
+        items[120] = (Pubkey.from_string("CHVTbSXJ3W1XEjQXx7BhV2ZSfzmQcbZzKTGZa6ph6BoH"), AccountType.TickArray)
+
+        snapshot = await fetcher.fetch_snapshot(items)
+        self.assertEqual(3, client.get_multiple_accounts_called)  # 52 tick arrays per chunk
+        self.assertEqual(300, snapshot.slot)
+        self.assertEqual(150, len(snapshot.accounts))
+        self.assertEqual(-112640, snapshot.accounts[120].start_tick_index)
+
+        client.advance = 1
+        with self.assertRaises(WhirlpoolError):
+            await fetcher.fetch_snapshot(items)
+
+    async def test_hot_refresh_whirlpools_01(self):
+        sol_usdc = Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ")
+        samo_usdc = Pubkey.from_string("9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe")
+        client = AsyncClientStub([
+            "sol_usdc_wp_whirlpool.HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ.json",
+            "samo_usdc_wp_whirlpool.9vqYJjDUFecLL2xPUC4Rc7hyCtZ6iJ4mDiVZX7aFXoAe.json",
+        ])
+        client.context_slot = 100
+        fetcher = AccountFetcher(client)
+
+        cached = await fetcher.get_whirlpool(sol_usdc)
+        self.assertEqual(179999872843830, cached.liquidity)
+        self.assertEqual(3706015876595606636, cached.sqrt_price)
+        self.assertEqual(-32101, cached.tick_current_index)
+
+        # update hot fields on chain
+        account = client._cache[str(sol_usdc)]
+        data = bytearray(account.data)
+        data[49:65] = (12345).to_bytes(16, "little")
+        data[65:81] = (3700000000000000000).to_bytes(16, "little")
+        data[81:85] = (-32200).to_bytes(4, "little", signed=True)
+        client._cache[str(sol_usdc)] = Account(account.lamports, bytes(data), account.owner, account.executable, account.rent_epoch)
+        client.context_slot = 101
+
+        client.get_multiple_accounts_called = 0
+        refreshed = await fetcher.hot_refresh_whirlpools([sol_usdc, samo_usdc, Keypair().pubkey()])
+        # one sliced request for cached whirlpool, one full request for others
+        self.assertEqual(2, client.get_multiple_accounts_called)
+        self.assertEqual(3, len(refreshed))
+        self.assertEqual(12345, refreshed[0].liquidity)
+        self.assertEqual(3700000000000000000, refreshed[0].sqrt_price)
+        self.assertEqual(-32200, refreshed[0].tick_current_index)
+        self.assertEqual(cached.fee_growth_global_a, refreshed[0].fee_growth_global_a)
+        self.assertEqual(cached.pubkey, refreshed[0].pubkey)
+        self.assertEqual(-110930, refreshed[1].tick_current_index)
+        self.assertIsNone(refreshed[2])
+        # only hot fields are at slot 101
+        self.assertEqual(100, fetcher.get_slot(sol_usdc))
+        self.assertEqual(101, fetcher.get_slot(samo_usdc))
+        self.assertEqual(101, fetcher.cache.latest_slot)
+
+        # patched whirlpool is cached
+        client.get_multiple_accounts_called = 0
+        client.get_account_info_called = 0
+        whirlpool = await fetcher.get_whirlpool(sol_usdc)
+        self.assertEqual(0, client.get_account_info_called)
+        self.assertEqual(-32200, whirlpool.tick_current_index)
+
+        # both are cached now
+        refreshed = await fetcher.hot_refresh_whirlpools([sol_usdc, samo_usdc])
+        self.assertEqual(1, client.get_multiple_accounts_called)
+        self.assertEqual(-110930, refreshed[1].tick_current_index)
+
+    async def test_refresh_changed_01(self):
+        sol_usdc = Pubkey.from_string("HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ")
+        ta = Pubkey.from_string("2Eh8HEeu45tCWxY6ruLLRN6VcTSD7bfshGj7bZA87Kne")
+        missing = Keypair().pubkey()
+        client = AsyncClientStub([
+            "sol_usdc_wp_whirlpool.HJPjoWUrhoZzkNfRpHuieeFk9WcZWjwy6PBjZ81ngndJ.json",
+            "sol_usdc_wp_ta_n33792.2Eh8HEeu45tCWxY6ruLLRN6VcTSD7bfshGj7bZA87Kne.json",
+        ])
+        fetcher = AccountFetcher(client)
+        items = [(sol_usdc, AccountType.Whirlpool), (ta, AccountType.TickArray), (missing, AccountType.TickArray)]
+
+        # first refresh: all existing accounts are new
+        changed = await fetcher.refresh_changed(items)
+        self.assertEqual([sol_usdc, ta], changed)
+        whirlpool = await fetcher.get_whirlpool(sol_usdc)
+        tick_array = await fetcher.get_tick_array(ta)
+
+        # nothing changed: cached instances are reused, but slot is updated
+        client.context_slot = 10
+        changed = await fetcher.refresh_changed(items)
+        self.assertEqual([], changed)
+        self.assertIs(whirlpool, await fetcher.get_whirlpool(sol_usdc))
+        self.assertIs(tick_array, await fetcher.get_tick_array(ta))
+        self.assertEqual(10, fetcher.get_slot(ta))
+
+        # whirlpool changed
+        account = client._cache[str(sol_usdc)]
+        data = bytearray(account.data)
+        data[81:85] = (-32200).to_bytes(4, "little", signed=True)
+        client._cache[str(sol_usdc)] = Account(account.lamports, bytes(data), account.owner, account.executable, account.rent_epoch)
+        changed = await fetcher.refresh_changed(items)
+        self.assertEqual([sol_usdc], changed)
+        self.assertEqual(-32200, (await fetcher.get_whirlpool(sol_usdc)).tick_current_index)
+        self.assertIs(tick_array, await fetcher.get_tick_array(ta))
+
     async def test_get_latest_block_timestamp_01(self):
         client = AsyncClientStub([], ASYNC_CLIENT_STUB_BLOCK_SLOT, ASYNC_CLIENT_STUB_BLOCK_TIMESTAMP)
         fetcher = AccountFetcher(client)
@@ -842,6 +1968,74 @@ class AccountFetcherAndParserAndKeyedConverterTestCase(unittest.IsolatedAsyncioT
 
 
 class TokenUtilTestCase(unittest.IsolatedAsyncioTestCase):
+    def test_deserialize_account_01(self):
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        json_filepaths = sorted(dir.glob("user_ata_*.json")) + sorted(dir.glob("*_vault*.json"))
+        self.assertTrue(len(json_filepaths) > 0)
+        for json_filepath in json_filepaths:
+            _, account = load_account_json(str(json_filepath))
+            result = TokenUtil.deserialize_account(account.data, account.owner)
+            expected = ACCOUNT_LAYOUT.parse(account.data)
+            self.assertEqual(Pubkey(expected.mint), result.mint)
+            self.assertEqual(Pubkey(expected.owner), result.owner)
+            self.assertEqual(expected.amount, result.amount)
+            self.assertEqual(expected.state != 0, result.is_initialized)
+            self.assertEqual(expected.state == 2, result.is_frozen)
+            self.assertEqual(expected.is_native_option == 1, result.is_native)
+            self.assertEqual(account.data[166:], result.tlv_data)
+
+            # prefilter
+            self.assertEqual(expected.amount, TokenUtil.read_token_account_amount(account.data))
+            self.assertEqual(Pubkey(expected.mint), TokenUtil.read_token_account_mint(account.data))
+
+        self.assertIsNone(TokenUtil.read_token_account_amount(bytes(164)))
+        self.assertIsNone(TokenUtil.read_token_account_mint(bytes(164)))
+
+    def test_deserialize_account_02(self):
+        mint = Keypair().pubkey()
+        owner = Keypair().pubkey()
+        delegate = Keypair().pubkey()
+        close_authority = Keypair().pubkey()
+        data = ACCOUNT_LAYOUT.build(dict(
+            mint=bytes(mint),
+            owner=bytes(owner),
+            amount=123,
+            delegate_option=1,
+            delegate=bytes(delegate),
+            state=2,
+            is_native_option=1,
+            is_native=2039280,
+            delegated_amount=45,
+            close_authority_option=1,
+            close_authority=bytes(close_authority),
+        ))
+        result = TokenUtil.deserialize_account(data, Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"))
+        self.assertEqual(mint, result.mint)
+        self.assertEqual(owner, result.owner)
+        self.assertEqual(123, result.amount)
+        self.assertEqual(delegate, result.delegate)
+        self.assertEqual(45, result.delegated_amount)
+        self.assertTrue(result.is_initialized)
+        self.assertTrue(result.is_frozen)
+        self.assertTrue(result.is_native)
+        self.assertEqual(close_authority, result.close_authority)
+        self.assertEqual(b"", result.tlv_data)
+
+    def test_deserialize_mint_01(self):
+        dir = pathlib.Path(ACCOUNT_JSON_FILES_DIR)
+        json_filepaths = [p for p in sorted(dir.glob("token_*.json")) if not p.name.startswith("token_badge")]
+        self.assertTrue(len(json_filepaths) > 0)
+        for json_filepath in json_filepaths:
+            _, account = load_account_json(str(json_filepath))
+            result = TokenUtil.deserialize_mint(account.data, account.owner)
+            expected = MINT_LAYOUT.parse(account.data)
+            self.assertEqual(None if expected.mint_authority_option == 0 else Pubkey(expected.mint_authority), result.mint_authority)
+            self.assertEqual(expected.supply, result.supply)
+            self.assertEqual(expected.decimals, result.decimals)
+            self.assertEqual(expected.is_initialized != 0, result.is_initialized)
+            self.assertEqual(None if expected.freeze_authority_option == 0 else Pubkey(expected.freeze_authority), result.freeze_authority)
+            self.assertEqual(account.data[166:], result.tlv_data)
+
     def test_derive_ata_01(self):
         # Token Program
         owner = Pubkey.from_string("r21Gamwd9DtyjHeGywsneoQYR39C1VDwrw7tWxHAwh6")